@@ -1,16 +1,131 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from typing import Optional, List
-from datetime import datetime, timedelta
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from pydantic import BaseModel
-from fastapi.responses import FileResponse
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pydantic import BaseModel, Field
+from fastapi.responses import FileResponse, StreamingResponse
+from psycopg.rows import dict_row, tuple_row
+import asyncio
+from collections import namedtuple
+from itertools import groupby
+from operator import itemgetter
 import subprocess
 import os
 
+from aws_export import (ARROW_MEDIA_TYPE, ENCODERS, EXPORT_COLUMNS, EXPORT_MEDIA_TYPES, LIST_FORMATS,
+                        encode_arrow, encode_columnar)
+from aws_cache import ResponseCache, listen_for_changes
+from aws_client import DEFAULT_SITE_ID
+from aws_derived import DERIVED_COLUMNS, DerivedDayCache, daily_metric_rows
+from aws_downsample import LTTB_COLUMNS, lttb_select, parse_resolution
+from aws_http import CompressionMiddleware, FastJSONResponse, json_dumps
+from aws_pool import AsyncDatabasePool
+from aws_query import (STATION_TZ, InvalidCursor, day_bounds, decode_cursor, encode_cursor, keyset_filter,
+                       local_now, local_today, parse_date, row_filter, to_local, where_clause)
+from aws_rollup import bucket_query, stats_query, version_query
+from aws_stream import StreamOverflow, WeatherBroadcaster
 
-app = FastAPI(title="Smart Farm Weather API", version="1.0.0")
+
+# DB 연결 설정
+DB_CONFIG = {
+    "host": "localhost",
+    "dbname": "aws_log",
+    "user": "hyejin",
+    "password": "smartfarm"  # 실제 비밀번호로 변경
+}
+
+# 연결 풀 설정 (최대 크기는 Postgres max_connections 여유분 안에서)
+POOL_MIN_SIZE = 2
+POOL_MAX_SIZE = 20
+POOL_ACQUIRE_TIMEOUT = 5.0
+POOL_HEALTH_CHECK_INTERVAL = 30.0
+
+# latest/today/stats 응답 캐시 (적재 시 LISTEN/NOTIFY로 무효화, 알림을 놓쳐도 TTL초 뒤 만료)
+CACHE_MAX_ENTRIES = 256
+CACHE_TTL = 60.0
+
+# 조건부 요청 응답 헤더: 오늘/범위 조회는 매번 ETag로 재검증
+# 특정 날짜 조회는 자정 직후 전날 마지막 행이 늦게 적재될 수 있으므로 그보다 이전 날짜만 immutable
+REVALIDATE_CACHE_CONTROL = "no-cache"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+IMMUTABLE_AFTER = timedelta(days=1)
+
+# 응답 압축 (Accept-Encoding에 따라 br/gzip, 이보다 작은 응답은 그대로)
+COMPRESS_MIN_SIZE = 1024
+
+# /api/weather/range 한 페이지 최대 행 수
+RANGE_MAX_PAGE_SIZE = 5000
+
+# /api/weather/batch 한 번에 보낼 수 있는 조회 수
+BATCH_MAX_QUERIES = 20
+
+# 다운샘플링 max_points 상한 (기상대/장비, 센서별 점 수)
+DOWNSAMPLE_MAX_POINTS = 5000
+
+# /api/weather/export 서버 측 cursor에서 한 번에 가져와 내보내는 행 수 (Parquet은 row group 크기)
+EXPORT_CHUNK_ROWS = 10000
+
+# /api/weather/stream: 구독자별로 쌓아 둘 수 있는 행 수 (넘치면 연결을 끊고 재개하게 함), keepalive 간격(초),
+# 재개 시 다시 보내 주는 최대 구간 (그보다 오래된 구간은 /api/weather/range로)
+STREAM_QUEUE_SIZE = 1000
+STREAM_KEEPALIVE = 15.0
+STREAM_MAX_REPLAY = timedelta(hours=24)
+
+# 파생 지표 메모 (기상대/장비 수 x 일 수 x 조회 조건 수만큼 항목, 넘치면 오래 안 쓴 날부터 제거)
+DERIVED_CACHE_MAX_ENTRIES = 20000
+
+# 여러 엔드포인트가 같이 쓰는 쿼리 파라미터
+LIST_FORMAT_QUERY = Query("rows", pattern=f"^({'|'.join(LIST_FORMATS)})$", description="응답 형식: rows(행 목록), columnar(컬럼별 배열 JSON), arrow(Arrow IPC stream)")
+EXCLUDE_FLAGS_QUERY = Query(None, description="제외할 품질 플래그 비트마스크 (1 멈춤, 2 범위 밖, 4 급변, 8 누락 직후, 16 배터리 부족)")
+SITE_QUERY = Query(None, description="기상대 번호 (미지정 시 전체)")
+RESOLUTION_QUERY = Query(None, pattern=r"^\d+[mhd]$", description="시간 버킷 간격 (예: 15m, 1h, 1d). 지정 시 기상대/장비별 버킷의 평균/최소/최대")
+MAX_POINTS_QUERY = Query(None, ge=3, le=DOWNSAMPLE_MAX_POINTS, description="기상대/장비별 LTTB 다운샘플링 점 수 (temp/humid/radn 기준)")
+
+db_pool = None
+broadcaster = None
+response_cache = ResponseCache(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL)
+derived_cache = DerivedDayCache(max_entries=DERIVED_CACHE_MAX_ENTRIES)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    앱 시작 시 연결 풀 생성과 변경 알림 수신 시작, 종료 시 모든 연결 닫기
+    변경 알림은 LISTEN 연결 하나로 받아 응답 캐시/파생 지표 메모 무효화와 실시간 전송에 함께 사용
+    """
+    global db_pool, broadcaster
+    db_pool = AsyncDatabasePool(
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        acquire_timeout=POOL_ACQUIRE_TIMEOUT,
+        health_check_interval=POOL_HEALTH_CHECK_INTERVAL,
+        **DB_CONFIG,
+    )
+    await db_pool.open()
+    broadcaster = WeatherBroadcaster(fetch_rows, queue_size=STREAM_QUEUE_SIZE)
+    tasks = [
+        asyncio.create_task(broadcaster.run()),
+        asyncio.create_task(listen_for_changes(response_cache, on_change=on_data_change, **DB_CONFIG)),
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await db_pool.close()
+        db_pool = None
+
+
+def on_data_change(change):
+    """변경 알림 payload (재연결 시 None) -> 파생 지표 메모 무효화 + 실시간 전송"""
+    derived_cache.invalidate(change)
+    broadcaster.notify(change)
+
+
+app = FastAPI(title="Smart Farm Weather API", version="1.0.0", lifespan=lifespan)
 
 # CORS 설정 (외부에서 접근 가능하도록)
 app.add_middleware(
@@ -20,22 +135,201 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(CompressionMiddleware, minimum_size=COMPRESS_MIN_SIZE)
 
-# DB 연결 설정
-DB_CONFIG = {
-    "host": "localhost",
-    "database": "aws_log",
-    "user": "hyejin",
-    "password": "smartfarm"  # 실제 비밀번호로 변경
-}
 
+async def fetch_one(query, params=()):
+    """풀에서 빌린 연결로 조회한 첫 행 (엔드포인트에서 예외가 나도 연결은 풀로 반환)"""
+    async with db_pool.connection() as conn:
+        cur = await conn.execute(query, params)
+        return await cur.fetchone()
 
-def get_db_connection():
-    return psycopg2.connect(**DB_CONFIG, cursor_factory=RealDictCursor)
+
+async def fetch_list(query, params=(), format="rows"):
+    """
+    목록 조회 결과의 (컬럼 이름, 행 목록)
+    format=rows면 dict 행, 그 외(columnar/arrow 등)는 튜플 행 (컬럼별로 바로 묶을 수 있도록)
+    """
+    async with db_pool.connection() as conn:
+        cur = conn.cursor(row_factory=dict_row if format == "rows" else tuple_row)
+        await cur.execute(query, params)
+        rows = await cur.fetchall()
+        return [column.name for column in cur.description], rows
+
+
+async def fetch_rows(query, params=()):
+    """fetch_list의 dict 행 목록만"""
+    return (await fetch_list(query, params))[1]
+
+
+def list_response(columns, rows, format):
+    """
+    format=rows면 dict 행을 orjson으로 바로 직렬화 (response_model은 문서용, 행마다 모델을 만들지 않음)
+    columnar/arrow면 컬럼 단위로 바로 인코딩한 Response
+    """
+    if format == "columnar":
+        return Response(encode_columnar(columns, rows), media_type="application/json")
+    if format == "arrow":
+        return Response(encode_arrow(columns, rows), media_type=ARROW_MEDIA_TYPE)
+    return FastJSONResponse(rows)
+
+
+def downsample_width(resolution, max_points):
+    """resolution/max_points 파라미터 확인 (잘못되면 400), resolution 버킷 간격 timedelta 반환"""
+    if resolution and max_points:
+        raise HTTPException(status_code=400, detail="resolution과 max_points는 함께 쓸 수 없습니다")
+    if not resolution:
+        return None
+    try:
+        return parse_resolution(resolution)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+async def downsample_response(start, end, format, width=None, max_points=None, site=None, exclude_flags=None):
+    """
+    긴 구간을 그래프용으로 줄인 응답 (기간 길이와 무관하게 응답 크기가 버킷 수/점 수로 제한됨, 데이터가 없으면 None)
+    - width (resolution): SQL에서 기상대/장비별 시간 버킷의 평균/최소/최대 (1시간/1일 단위는 집계 테이블)
+    - max_points: 기상대/장비별로 LTTB를 적용해 고른 원본 행 (temp/humid/radn 각각 최대 max_points개 점 보존)
+    """
+    if width:
+        query, params = bucket_query(width, start, end, site=site, exclude_flags=exclude_flags)
+        columns, rows = await fetch_list(query, params, format)
+        if not rows:
+            return None
+        # 버킷 행은 WeatherData 모양이 아니지만 list_response는 response_model 검증 없이 반환
+        return list_response(columns, rows, format)
+
+    # LTTB에 필요한 컬럼만 읽고, 고른 행만 전체 컬럼으로 다시 조회
+    where_sql, params = where_clause(start, end, site=site, exclude_flags=exclude_flags)
+    _, rows = await fetch_list(f"""
+        SELECT site_id, dev_id, timestamp, {', '.join(LTTB_COLUMNS)} FROM weather_data
+        {where_sql}
+        ORDER BY site_id, dev_id, timestamp
+    """, params, "tuple")
+    if not rows:
+        return None
+
+    keys = []
+    for _, group in groupby(rows, key=itemgetter(0, 1)):
+        group = list(group)
+        values = [[row[i] for row in group] for i in range(3, 3 + len(LTTB_COLUMNS))]
+        keys.extend(group[i][:3] for i in lttb_select([row[2] for row in group], values, max_points))
+
+    sites, devs, stamps = (list(column) for column in zip(*keys))
+    # 구간 조건도 같이 넣어 해당 월 파티션만 찾음
+    columns, selected = await fetch_list(f"""
+        SELECT * FROM weather_data
+        {where_sql} AND (site_id, dev_id, timestamp) IN (
+            SELECT * FROM unnest(%s::integer[], %s::integer[], %s::timestamp[])
+        )
+        ORDER BY timestamp DESC, site_id DESC, dev_id DESC
+    """, (*params, sites, devs, stamps), format)
+    return list_response(columns, selected, format)
+
+
+async def data_version(start, end, site=None, exclude_flags=None):
+    """
+    조회 구간의 데이터 버전 {'last': 마지막 timestamp, 'count': 행 수} (ETag 계산용)
+    응답 캐시에 함께 보관하므로 적재 알림 전까지는 DB 조회 없이 304 응답
+    날짜 단위 구간은 집계 테이블로 세므로 적재 알림마다 다시 조회해도 구간 길이만큼 원본을 세지 않음
+    """
+    query, params = version_query(start, end, site=site, exclude_flags=exclude_flags)
+    return await response_cache.get_or_load(('version', query, params), lambda: fetch_one(query, params))
+
+
+def validator_headers(version, cache_control=REVALIDATE_CACHE_CONTROL):
+    """데이터 버전 -> ETag/Last-Modified/Cache-Control 헤더 (구간에 데이터가 없으면 Cache-Control만)"""
+    headers = {"Cache-Control": cache_control}
+    if version and version['last'] is not None:
+        last = version['last']
+        # 행 단위 갱신은 같은 버전으로 보임 (행 추가/삭제와 마지막 시각 변화만 반영)
+        headers["ETag"] = f'W/"{version["count"]}-{last:%Y%m%d%H%M%S}"'
+        headers["Last-Modified"] = format_datetime(
+            last.replace(tzinfo=STATION_TZ).astimezone(timezone.utc), usegmt=True)
+    return headers
+
+
+def not_modified(request, headers):
+    """If-None-Match가 현재 ETag와 같으면 본문 없는 304 Response, 아니면 None"""
+    etag = headers.get("ETag")
+    if_none_match = request.headers.get("if-none-match")
+    if not etag or not if_none_match:
+        return None
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    if "*" in tags or etag.removeprefix("W/") in tags:
+        return Response(status_code=304, headers=headers)
+    return None
+
+
+def with_headers(result, headers):
+    result.headers.update(headers)
+    return result
+
+
+# 엔드포인트별 조회 SQL (각 엔드포인트와 /api/weather/batch에서 함께 사용)
+def latest_query(site=None, exclude_flags=None):
+    where_sql, params = where_clause(site=site, exclude_flags=exclude_flags)
+    return f"""
+        SELECT * FROM weather_data 
+        {where_sql}
+        ORDER BY timestamp DESC 
+        LIMIT 1
+    """, params
+
+
+def rows_query(start, end=None, site=None, exclude_flags=None):
+    """시각 구간의 모든 행 (최신순) - today/date/recent"""
+    where_sql, params = where_clause(start, end, site=site, exclude_flags=exclude_flags)
+    return f"""
+        SELECT * FROM weather_data 
+        {where_sql}
+        ORDER BY timestamp DESC
+    """, params
+
+
+def range_query(start, end, limit, cursor=None, site=None, exclude_flags=None):
+    """
+    날짜 범위 한 페이지 (다음 페이지가 있는지 보려고 limit + 1행)
+    cursor(decode_cursor 결과) 다음 행부터 (OFFSET 없이 인덱스에서 바로 시작)
+    """
+    where_sql, params = where_clause(start, end, site=site, exclude_flags=exclude_flags)
+    after_sql, after_params = keyset_filter(cursor)
+    return f"""
+        SELECT * FROM weather_data 
+        {where_sql}{after_sql}
+        ORDER BY timestamp DESC, site_id DESC, dev_id DESC
+        LIMIT %s
+    """, (*params, *after_params, limit + 1)
+
+
+def derived_query(start, end, site=None, exclude_flags=None):
+    """파생 지표 계산용 컬럼만 (일 수는 SQL에서 정수로 받아 배열 변환 시 datetime을 거치지 않음)"""
+    where_sql, params = where_clause(start, end, site=site, exclude_flags=exclude_flags)
+    return f"""
+        SELECT site_id, dev_id, timestamp::date - DATE '1970-01-01' AS day, temp, humid, radn
+        FROM weather_data
+        {where_sql}
+        ORDER BY site_id, dev_id, timestamp
+    """, params
+
+
+def low_light_query(threshold, days, site=None, exclude_flags=None):
+    """최근 days일 동안 일조량이 threshold 미만인 행 (최신순)"""
+    since, _ = day_bounds(local_today() - timedelta(days=days))
+    where_sql, params = where_clause(since, site=site, exclude_flags=exclude_flags)
+    return f"""
+        SELECT * FROM weather_data 
+        {where_sql}
+        AND radn < %s
+        ORDER BY timestamp DESC
+    """, (*params, threshold)
 
 
 # 응답 모델
 class WeatherData(BaseModel):
+    site_id: Optional[int] = None
+    dev_id: Optional[int] = None
     timestamp: datetime
     temp: Optional[float]
     humid: Optional[float]
@@ -44,6 +338,8 @@ class WeatherData(BaseModel):
     wind: Optional[float]
     rainfall: Optional[float]
     battery: Optional[float]
+    rain_increment: Optional[float] = None
+    qc_flags: Optional[int] = None
 
 
 class WeatherStats(BaseModel):
@@ -56,6 +352,83 @@ class WeatherStats(BaseModel):
     data_count: int
 
 
+class BatchQuery(BaseModel):
+    """/api/weather/batch 조회 하나 (type별로 해당 엔드포인트와 같은 파라미터)"""
+    type: str = Field(..., pattern="^(latest|today|date|range|stats|recent|low-light)$")
+    site: Optional[int] = None
+    exclude_flags: Optional[int] = None
+    date: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    limit: int = Field(1000, ge=1, le=RANGE_MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
+    hours: int = 24
+    days: int = 7
+    threshold: float = 100
+
+
+class BatchRequest(BaseModel):
+    queries: List[BatchQuery] = Field(..., min_length=1, max_length=BATCH_MAX_QUERIES)
+
+
+# 배치 조회 하나의 SQL과 결과 해석 방법 (one: 첫 행만, empty_detail: 결과가 없을 때 404 메시지, limit: range 페이지 크기)
+BatchStep = namedtuple('BatchStep', ['sql', 'params', 'one', 'empty_detail', 'limit'])
+
+# type별 필수 파라미터
+BATCH_REQUIRED = {
+    'date': ['date'],
+    'range': ['start_date', 'end_date'],
+}
+
+
+def batch_step(item):
+    """BatchQuery -> BatchStep (날짜 형식이 틀리면 ValueError, cursor가 틀리면 InvalidCursor)"""
+    site, flags = item.site, item.exclude_flags
+    if item.type == "latest":
+        return BatchStep(*latest_query(site, flags), True, "데이터가 없습니다", None)
+    if item.type == "today":
+        query = rows_query(*day_bounds(local_today()), site=site, exclude_flags=flags)
+        return BatchStep(*query, False, "오늘 데이터가 없습니다", None)
+    if item.type == "date":
+        query = rows_query(*day_bounds(item.date), site=site, exclude_flags=flags)
+        return BatchStep(*query, False, f"{item.date} 데이터가 없습니다", None)
+    if item.type == "range":
+        cursor = decode_cursor(item.cursor) if item.cursor else None
+        query = range_query(*day_bounds(item.start_date, item.end_date), item.limit, cursor,
+                            site=site, exclude_flags=flags)
+        return BatchStep(*query, False, "해당 기간의 데이터가 없습니다" if cursor is None else None, item.limit)
+    if item.type == "stats":
+        if item.start_date and item.end_date:
+            bounds = day_bounds(item.start_date, item.end_date)
+        else:
+            bounds = day_bounds(local_today())
+        return BatchStep(*stats_query(*bounds, site=site, exclude_flags=flags), True, "통계 데이터가 없습니다", None)
+    if item.type == "recent":
+        query = rows_query(local_now() - timedelta(hours=item.hours), site=site, exclude_flags=flags)
+        return BatchStep(*query, False, f"최근 {item.hours}시간 데이터가 없습니다", None)
+    return BatchStep(*low_light_query(item.threshold, item.days, site, flags), False, None, None)
+
+
+def batch_result(item, step, rows):
+    """조회 결과 -> {"type", "status", "data" | "detail"} (range는 next_cursor 포함)"""
+    if step.one:
+        data = rows[0] if rows else None
+        empty = data is None or data.get('data_count') == 0
+    else:
+        data = rows
+        empty = not rows
+    if empty and step.empty_detail:
+        return {"type": item.type, "status": 404, "detail": step.empty_detail}
+
+    result = {"type": item.type, "status": 200, "data": data}
+    if step.limit is not None:
+        result["next_cursor"] = None
+        if len(rows) > step.limit:
+            result["data"] = rows[:step.limit]
+            result["next_cursor"] = encode_cursor(rows[step.limit - 1])
+    return result
+
+
 # 1. 헬스 체크
 @app.get("/")
 def read_root():
@@ -67,85 +440,102 @@ def read_root():
             "today": "/api/weather/today",
             "date": "/api/weather/date/{date}",
             "range": "/api/weather/range",
-            "stats": "/api/weather/stats"
+            "stats": "/api/weather/stats",
+            "export": "/api/weather/export",
+            "batch": "/api/weather/batch",
+            "pool": "/api/db/pool",
+            "stream": "/api/weather/stream",
+            "derived": "/api/weather/derived",
+            "cache": "/api/cache"
         }
     }
 
 
 # 2. 최신 데이터 조회
 @app.get("/api/weather/latest", response_model=WeatherData)
-def get_latest_weather():
+async def get_latest_weather(
+        site: Optional[int] = SITE_QUERY,
+        exclude_flags: Optional[int] = EXCLUDE_FLAGS_QUERY
+):
     """가장 최근 기상 데이터 1개 조회"""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT * FROM weather_data 
-            ORDER BY timestamp DESC 
-            LIMIT 1
-        """)
-        result = cur.fetchone()
-        cur.close()
-        conn.close()
+        query, params = latest_query(site, exclude_flags)
+        # 적재 전까지 결과가 같으므로 캐시 (적재 시 변경 알림으로 무효화)
+        result = await response_cache.get_or_load(('latest', site, exclude_flags), lambda: fetch_one(query, params))
 
         if not result:
             raise HTTPException(status_code=404, detail="데이터가 없습니다")
 
-        return result
+        return FastJSONResponse(result)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # 3. 오늘 데이터 조회
 @app.get("/api/weather/today", response_model=List[WeatherData])
-def get_today_weather():
-    """오늘 날짜의 모든 기상 데이터 조회"""
+async def get_today_weather(
+        request: Request,
+        format: str = LIST_FORMAT_QUERY,
+        site: Optional[int] = SITE_QUERY,
+        exclude_flags: Optional[int] = EXCLUDE_FLAGS_QUERY
+):
+    """오늘 날짜의 모든 기상 데이터 조회 (If-None-Match가 현재 ETag와 같으면 행 조회 없이 304)"""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT * FROM weather_data 
-            WHERE DATE(timestamp) = CURRENT_DATE
-            ORDER BY timestamp DESC
-        """)
-        results = cur.fetchall()
-        cur.close()
-        conn.close()
+        today = local_today()
+        headers = validator_headers(await data_version(*day_bounds(today), site=site, exclude_flags=exclude_flags))
+        unchanged = not_modified(request, headers)
+        if unchanged:
+            return unchanged
+
+        query, params = rows_query(*day_bounds(today), site=site, exclude_flags=exclude_flags)
+        # 날짜를 키에 넣어 자정이 지나면 전날 결과를 쓰지 않음
+        columns, results = await response_cache.get_or_load(('today', today, format, site, exclude_flags),
+                                                            lambda: fetch_list(query, params, format))
 
         if not results:
             raise HTTPException(status_code=404, detail="오늘 데이터가 없습니다")
 
-        return results
+        return with_headers(list_response(columns, results, format), headers)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # 4. 특정 날짜 데이터 조회
 @app.get("/api/weather/date/{date}", response_model=List[WeatherData])
-def get_weather_by_date(date: str):
+async def get_weather_by_date(
+        request: Request,
+        date: str,
+        format: str = LIST_FORMAT_QUERY,
+        site: Optional[int] = SITE_QUERY,
+        exclude_flags: Optional[int] = EXCLUDE_FLAGS_QUERY
+):
     """
     특정 날짜의 기상 데이터 조회
     date 형식: YYYY-MM-DD (예: 2024-11-02)
+    어제 이전 날짜는 바뀌지 않으므로 immutable 캐시 헤더
     """
     try:
-        # 날짜 형식 검증
-        datetime.strptime(date, "%Y-%m-%d")
-
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT * FROM weather_data 
-            WHERE DATE(timestamp) = %s
-            ORDER BY timestamp DESC
-        """, (date,))
-        results = cur.fetchall()
-        cur.close()
-        conn.close()
+        # 날짜 형식 검증 + 하루치 시각 구간
+        bounds = day_bounds(date)
+        past = parse_date(date) < local_today() - IMMUTABLE_AFTER
+        headers = validator_headers(await data_version(*bounds, site=site, exclude_flags=exclude_flags),
+                                    IMMUTABLE_CACHE_CONTROL if past else REVALIDATE_CACHE_CONTROL)
+        unchanged = not_modified(request, headers)
+        if unchanged:
+            return unchanged
+
+        columns, results = await fetch_list(*rows_query(*bounds, site=site, exclude_flags=exclude_flags), format)
 
         if not results:
             raise HTTPException(status_code=404, detail=f"{date} 데이터가 없습니다")
 
-        return results
+        return with_headers(list_response(columns, results, format), headers)
+    except HTTPException:
+        raise
     except ValueError:
         raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)")
     except Exception as e:
@@ -154,33 +544,65 @@ def get_weather_by_date(date: str):
 
 # 5. 날짜 범위 데이터 조회
 @app.get("/api/weather/range", response_model=List[WeatherData])
-def get_weather_by_range(
+async def get_weather_by_range(
+        request: Request,
         start_date: str = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
         end_date: str = Query(..., description="종료 날짜 (YYYY-MM-DD)"),
-        limit: int = Query(1000, description="최대 조회 개수")
+        limit: int = Query(1000, ge=1, le=RANGE_MAX_PAGE_SIZE, description="페이지 크기"),
+        cursor: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor 값 (다음 페이지)"),
+        format: str = LIST_FORMAT_QUERY,
+        resolution: Optional[str] = RESOLUTION_QUERY,
+        max_points: Optional[int] = MAX_POINTS_QUERY,
+        site: Optional[int] = SITE_QUERY,
+        exclude_flags: Optional[int] = EXCLUDE_FLAGS_QUERY
 ):
-    """날짜 범위로 기상 데이터 조회"""
+    """
+    날짜 범위로 기상 데이터 조회 (최신순, 페이지 단위)
+    다음 페이지가 있으면 X-Next-Cursor / Link 헤더로 cursor 전달. 같은 조건에 cursor만 붙여 다시 요청
+    resolution/max_points 지정 시 페이지 없이 구간 전체를 줄여서 반환 (limit/cursor 사용 안 함)
+    ETag는 페이지가 아니라 조회 구간 전체의 데이터 버전 (If-None-Match가 같으면 행 조회 없이 304)
+    """
+    width = downsample_width(resolution, max_points)
+    if (width or max_points) and cursor:
+        raise HTTPException(status_code=400, detail="다운샘플링 응답에는 cursor를 쓸 수 없습니다")
     try:
-        # 날짜 형식 검증
-        datetime.strptime(start_date, "%Y-%m-%d")
-        datetime.strptime(end_date, "%Y-%m-%d")
-
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT * FROM weather_data 
-            WHERE DATE(timestamp) BETWEEN %s AND %s
-            ORDER BY timestamp DESC
-            LIMIT %s
-        """, (start_date, end_date, limit))
-        results = cur.fetchall()
-        cur.close()
-        conn.close()
-
-        if not results:
+        # 날짜 형식 검증 + 시각 구간
+        bounds = day_bounds(start_date, end_date)
+        headers = validator_headers(await data_version(*bounds, site=site, exclude_flags=exclude_flags))
+        unchanged = not_modified(request, headers)
+        if unchanged:
+            return unchanged
+
+        if width or max_points:
+            result = await downsample_response(*bounds, format, width, max_points,
+                                               site=site, exclude_flags=exclude_flags)
+            if result is None:
+                raise HTTPException(status_code=404, detail="해당 기간의 데이터가 없습니다")
+            return with_headers(result, headers)
+
+        # 이전 페이지 마지막 행 다음부터
+        query, page_params = range_query(*bounds, limit,
+                                         decode_cursor(cursor) if cursor else None,
+                                         site=site, exclude_flags=exclude_flags)
+        columns, results = await fetch_list(query, page_params, format)
+
+        if not results and cursor is None:
             raise HTTPException(status_code=404, detail="해당 기간의 데이터가 없습니다")
 
-        return results
+        next_cursor = None
+        if len(results) > limit:
+            results = results[:limit]
+            last = results[-1] if format == "rows" else dict(zip(columns, results[-1]))
+            next_cursor = encode_cursor(last)
+
+        if next_cursor:
+            headers["X-Next-Cursor"] = next_cursor
+            headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+        return with_headers(list_response(columns, results, format), headers)
+    except HTTPException:
+        raise
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except ValueError:
         raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)")
     except Exception as e:
@@ -189,59 +611,35 @@ def get_weather_by_range(
 
 # 6. 통계 데이터 조회
 @app.get("/api/weather/stats", response_model=WeatherStats)
-def get_weather_stats(
+async def get_weather_stats(
         start_date: Optional[str] = Query(None, description="시작 날짜 (YYYY-MM-DD)"),
-        end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD)")
+        end_date: Optional[str] = Query(None, description="종료 날짜 (YYYY-MM-DD)"),
+        site: Optional[int] = SITE_QUERY,
+        exclude_flags: Optional[int] = EXCLUDE_FLAGS_QUERY
 ):
     """
     기상 데이터 통계 조회
     날짜 미지정 시 오늘 데이터 기준
     """
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-
         if start_date and end_date:
             # 날짜 범위 지정
-            datetime.strptime(start_date, "%Y-%m-%d")
-            datetime.strptime(end_date, "%Y-%m-%d")
-            query = """
-                SELECT 
-                    AVG(temp) as avg_temp,
-                    MAX(temp) as max_temp,
-                    MIN(temp) as min_temp,
-                    AVG(humid) as avg_humid,
-                    SUM(rainfall) as total_rainfall,
-                    AVG(radn) as avg_radn,
-                    COUNT(*) as data_count
-                FROM weather_data
-                WHERE DATE(timestamp) BETWEEN %s AND %s
-            """
-            cur.execute(query, (start_date, end_date))
+            bounds = day_bounds(start_date, end_date)
         else:
             # 오늘 데이터
-            query = """
-                SELECT 
-                    AVG(temp) as avg_temp,
-                    MAX(temp) as max_temp,
-                    MIN(temp) as min_temp,
-                    AVG(humid) as avg_humid,
-                    SUM(rainfall) as total_rainfall,
-                    AVG(radn) as avg_radn,
-                    COUNT(*) as data_count
-                FROM weather_data
-                WHERE DATE(timestamp) = CURRENT_DATE
-            """
-            cur.execute(query)
-
-        result = cur.fetchone()
-        cur.close()
-        conn.close()
+            bounds = day_bounds(local_today())
+        # 품질 플래그 조건이 없으면 일 단위 집계 테이블에서 계산 (기간 길이와 무관하게 일정한 비용)
+        query, params = stats_query(*bounds, site=site, exclude_flags=exclude_flags)
+
+        result = await response_cache.get_or_load(('stats', bounds, site, exclude_flags),
+                                                  lambda: fetch_one(query, params))
 
         if not result or result['data_count'] == 0:
             raise HTTPException(status_code=404, detail="통계 데이터가 없습니다")
 
-        return result
+        return FastJSONResponse(result)
+    except HTTPException:
+        raise
     except ValueError:
         raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)")
     except Exception as e:
@@ -250,60 +648,310 @@ def get_weather_stats(
 
 # 7. 최근 N시간 데이터 조회
 @app.get("/api/weather/recent", response_model=List[WeatherData])
-def get_recent_weather(hours: int = Query(24, description="최근 몇 시간")):
-    """최근 N시간의 기상 데이터 조회"""
+async def get_recent_weather(
+        hours: int = Query(24, description="최근 몇 시간"),
+        format: str = LIST_FORMAT_QUERY,
+        resolution: Optional[str] = RESOLUTION_QUERY,
+        max_points: Optional[int] = MAX_POINTS_QUERY,
+        site: Optional[int] = SITE_QUERY,
+        exclude_flags: Optional[int] = EXCLUDE_FLAGS_QUERY
+):
+    """최근 N시간의 기상 데이터 조회 (resolution/max_points 지정 시 다운샘플링)"""
+    width = downsample_width(resolution, max_points)
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT * FROM weather_data 
-            WHERE timestamp >= NOW() - INTERVAL '%s hours'
-            ORDER BY timestamp DESC
-        """, (hours,))
-        results = cur.fetchall()
-        cur.close()
-        conn.close()
+        since = local_now() - timedelta(hours=hours)
+        if width or max_points:
+            result = await downsample_response(since, None, format, width, max_points,
+                                               site=site, exclude_flags=exclude_flags)
+            if result is None:
+                raise HTTPException(status_code=404, detail=f"최근 {hours}시간 데이터가 없습니다")
+            return result
+
+        columns, results = await fetch_list(*rows_query(since, site=site, exclude_flags=exclude_flags), format)
 
         if not results:
             raise HTTPException(status_code=404, detail=f"최근 {hours}시간 데이터가 없습니다")
 
-        return results
+        return list_response(columns, results, format)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 # 8. 특정 조건으로 데이터 조회 (일조량 부족한 날)
 @app.get("/api/weather/low-light", response_model=List[WeatherData])
-def get_low_light_days(
+async def get_low_light_days(
         threshold: float = Query(100, description="일조량 임계값 (W/m²)"),
-        days: int = Query(7, description="최근 며칠")
+        days: int = Query(7, description="최근 며칠"),
+        format: str = LIST_FORMAT_QUERY,
+        site: Optional[int] = SITE_QUERY,
+        exclude_flags: Optional[int] = EXCLUDE_FLAGS_QUERY
 ):
     """일조량이 낮은 날의 데이터 조회 (보광 결정용)"""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT * FROM weather_data 
-            WHERE radn < %s 
-            AND DATE(timestamp) >= CURRENT_DATE - INTERVAL '%s days'
-            ORDER BY timestamp DESC
-        """, (threshold, days))
-        results = cur.fetchall()
-        cur.close()
-        conn.close()
-
-        return results
+        columns, results = await fetch_list(*low_light_query(threshold, days, site, exclude_flags), format)
+
+        return list_response(columns, results, format)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# 9. 대량 내보내기
+@app.get("/api/weather/export")
+async def export_weather(
+        start_date: str = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
+        end_date: str = Query(..., description="종료 날짜 (YYYY-MM-DD)"),
+        format: str = Query("csv", pattern="^(csv|ndjson|parquet)$", description="csv, ndjson, parquet"),
+        site: Optional[int] = SITE_QUERY,
+        exclude_flags: Optional[int] = EXCLUDE_FLAGS_QUERY
+):
+    """
+    날짜 범위의 기상 데이터를 시간순으로 스트리밍 (CSV / NDJSON / Parquet)
+    서버 측 cursor에서 EXPORT_CHUNK_ROWS행씩 읽어 바로 내보내므로 기간이 길어도 서버 메모리는 일정
+    """
+    try:
+        where_sql, params = where_clause(*day_bounds(start_date, end_date), site=site, exclude_flags=exclude_flags)
+        encoder = ENCODERS[format]()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)")
+    except ImportError:
+        raise HTTPException(status_code=501, detail=f"{format} 내보내기에는 pyarrow가 필요합니다")
+
+    query = f"""
+        SELECT {', '.join(EXPORT_COLUMNS)} FROM weather_data
+        {where_sql}
+        ORDER BY timestamp, site_id, dev_id
+    """
+
+    async def stream():
+        yield encoder.header()
+        async with db_pool.connection() as conn:
+            # 서버 측 cursor는 트랜잭션 안에서만 유지됨
+            async with conn.transaction():
+                async with conn.cursor(name="weather_export", row_factory=tuple_row) as cur:
+                    await cur.execute(query, params)
+                    while True:
+                        rows = await cur.fetchmany(EXPORT_CHUNK_ROWS)
+                        if not rows:
+                            break
+                        yield encoder.encode(rows)
+        yield encoder.finish()
+
+    filename = f"weather_{start_date}_{end_date}.{format}"
+    return StreamingResponse(
+        stream(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+def resume_point(value):
+    """since / Last-Event-ID -> 재개 시각 (잘못되었거나 STREAM_MAX_REPLAY보다 오래되면 ValueError)"""
+    if value is None:
+        return None
+    since = to_local(value if isinstance(value, datetime) else datetime.fromisoformat(value))
+    if since < local_now() - STREAM_MAX_REPLAY:
+        raise ValueError(f"재개 구간은 최근 {STREAM_MAX_REPLAY.total_seconds() / 3600:.0f}시간까지만 가능합니다 "
+                         "(이전 구간은 /api/weather/range)")
+    return since
+
+
+def replay_loader(since, site):
+    """since 이후 이미 적재된 행을 시간순으로 가져오는 함수 (재개 지점이 없으면 None)"""
+    if since is None:
+        return None
+    site_sql, site_params = row_filter(site)
+    return lambda: fetch_rows(f"""
+        SELECT * FROM weather_data
+        WHERE timestamp > %s{site_sql}
+        ORDER BY timestamp, site_id, dev_id
+    """, (since, *site_params))
+
+
+def stream_event(event, data, id=None):
+    """Server-Sent Events 메시지 하나"""
+    message = f"id: {id}\n".encode() if id is not None else b""
+    return message + f"event: {event}\ndata: ".encode() + json_dumps(data) + b"\n\n"
+
+
+# 10. 여러 조회를 한 번에
+@app.post("/api/weather/batch")
+async def batch_weather(batch: BatchRequest):
+    """
+    latest/today/date/range/stats/recent/low-light 조회 여러 개를 한 번에 실행해 요청 순서대로 반환
+    연결 하나, 트랜잭션 스냅샷 하나(REPEATABLE READ READ ONLY)에서 실행하므로 위젯 간 데이터 시점이 같음
+    SQL은 pipeline으로 한꺼번에 보내므로 조회 수와 무관하게 DB 왕복은 한 번
+    파라미터가 잘못된 조회는 그 항목만 status 400
+    """
+    results = [None] * len(batch.queries)
+    steps = []
+    for i, item in enumerate(batch.queries):
+        missing = [name for name in BATCH_REQUIRED.get(item.type, []) if not getattr(item, name)]
+        try:
+            if missing:
+                raise ValueError(f"{item.type} 조회에는 {', '.join(missing)} 값이 필요합니다")
+            steps.append((i, item, batch_step(item)))
+        except InvalidCursor as e:
+            results[i] = {"type": item.type, "status": 400, "detail": str(e)}
+        except ValueError as e:
+            detail = str(e) if missing else "날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)"
+            results[i] = {"type": item.type, "status": 400, "detail": detail}
+
+    if not steps:
+        return FastJSONResponse({"results": results})
+
+    try:
+        async with db_pool.connection() as conn:
+            async with conn.transaction():
+                async with conn.pipeline():
+                    await conn.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ, READ ONLY")
+                    cursors = []
+                    for _, _, step in steps:
+                        cur = conn.cursor(row_factory=dict_row)
+                        await cur.execute(step.sql, step.params)
+                        cursors.append(cur)
+                rows = [await cur.fetchall() for cur in cursors]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    for (i, item, step), step_rows in zip(steps, rows):
+        results[i] = batch_result(item, step, step_rows)
+    return FastJSONResponse({"results": results})
+
+
+# 11. 실시간 전송
+@app.get("/api/weather/stream")
+async def stream_weather(
+        request: Request,
+        since: Optional[datetime] = Query(None, description="이 시각 이후 적재된 행부터 재개 (미지정 시 Last-Event-ID 헤더, 둘 다 없으면 새 행만)"),
+        site: Optional[int] = SITE_QUERY
+):
+    """
+    새로 적재된 행을 Server-Sent Events로 한 번씩 전달 (event: weather, id: 행 timestamp)
+    모든 구독자가 LISTEN 연결 하나와 알림당 조회 한 번을 공유하므로 DB 부하는 구독자 수와 무관
+    구독자가 따라오지 못하면 event: overflow(id는 재개 시각) 후 연결을 끊음 (EventSource는 Last-Event-ID로 자동 재개)
+    """
+    try:
+        since = resume_point(since or request.headers.get("last-event-id"))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def events():
+        yield f"retry: {int(STREAM_KEEPALIVE * 1000)}\n\n".encode()
+        try:
+            async for row in broadcaster.rows(replay_loader(since, site), site=site, keepalive=STREAM_KEEPALIVE):
+                if row is None:
+                    yield b": keepalive\n\n"
+                    continue
+                yield stream_event("weather", row, id=row['timestamp'].isoformat())
+        except StreamOverflow as e:
+            yield stream_event("overflow", {"since": e.since}, id=e.since.isoformat())
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.websocket("/api/weather/stream/ws")
+async def stream_weather_ws(websocket: WebSocket, since: Optional[str] = None, site: Optional[int] = None):
+    """
+    /api/weather/stream의 WebSocket 버전 (since는 ISO 시각)
+    메시지: {"event": "weather", "data": 행}, {"event": "keepalive"}, {"event": "overflow", "since": 재개 시각}
+    """
+    try:
+        since = resume_point(since)
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+
+    await websocket.accept()
+    try:
+        async for row in broadcaster.rows(replay_loader(since, site), site=site, keepalive=STREAM_KEEPALIVE):
+            if row is None:
+                await websocket.send_text('{"event":"keepalive"}')
+                continue
+            await websocket.send_text(json_dumps({"event": "weather", "data": row}).decode())
+    except StreamOverflow as e:
+        await websocket.send_text(json_dumps({"event": "overflow", "since": e.since}).decode())
+        await websocket.close(code=1013)
+    except WebSocketDisconnect:
+        pass
+
+
+# 12. 농업 파생 지표
+@app.get("/api/weather/derived")
+async def get_derived_metrics(
+        start_date: str = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
+        end_date: str = Query(..., description="종료 날짜 (YYYY-MM-DD)"),
+        base_temp: float = Query(10.0, description="GDD 기준 온도 (°C)"),
+        upper_temp: float = Query(30.0, description="GDD 상한 온도 (°C)"),
+        format: str = LIST_FORMAT_QUERY,
+        site: Optional[int] = SITE_QUERY,
+        exclude_flags: Optional[int] = EXCLUDE_FLAGS_QUERY
+):
+    """
+    기상대/장비별 일 단위 파생 지표 (날짜순)
+    VPD(kPa), 이슬점(°C), GDD(°C·일), DLI(mol/m²/일). 분 단위 원본은 서버에서 NumPy로 한 번에 계산
+    마감된 날(어제 이전)의 결과는 메모해 두고 다시 계산하지 않음 (늦게 적재되면 변경 알림으로 그 날만 무효화)
+    """
+    if upper_temp <= base_temp:
+        raise HTTPException(status_code=400, detail="upper_temp는 base_temp보다 커야 합니다")
+    try:
+        first, last = parse_date(start_date), parse_date(end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="날짜 형식이 올바르지 않습니다 (YYYY-MM-DD)")
+
+    try:
+        key = (site, exclude_flags or 0, base_temp, upper_temp)
+        closed_before = local_today() - IMMUTABLE_AFTER
+        days = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+        by_day = {}
+        for day in days:
+            if day < closed_before:
+                found, rows = derived_cache.get(day, key)
+                if found:
+                    by_day[day] = rows
+
+        missing = [day for day in days if day not in by_day]
+        if missing:
+            # 보통 메모가 없는 날은 구간 끝쪽(최근)에 몰려 있으므로 처음~마지막을 한 번에 조회
+            generation = derived_cache.generation
+            _, rows = await fetch_list(*derived_query(*day_bounds(missing[0], missing[-1]),
+                                                      site=site, exclude_flags=exclude_flags), "tuple")
+            date_col = DERIVED_COLUMNS.index('date')
+            computed = {day: list(group) for day, group in
+                        groupby(sorted(daily_metric_rows(rows, base_temp, upper_temp), key=itemgetter(date_col)),
+                                key=itemgetter(date_col))}
+            for day in missing:
+                by_day[day] = computed.get(day, [])
+                if day < closed_before:
+                    derived_cache.put(day, key, by_day[day], generation)
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    results = [row for day in days for row in by_day[day]]
+    if not results:
+        raise HTTPException(status_code=404, detail="해당 기간의 데이터가 없습니다")
+
+    if format == "rows":
+        results = [dict(zip(DERIVED_COLUMNS, row)) for row in results]
+    return list_response(DERIVED_COLUMNS, results, format)
+
 
 @app.get("/api/graph/generate")
-def generate_weather_graph(days: int = 7):
-    """기상 데이터 그래프 생성"""
+def generate_weather_graph(
+    days: int = 7,
+    site: int = Query(DEFAULT_SITE_ID, description="그래프를 그릴 기상대 번호"),
+):
+    """기상 데이터 그래프 생성 (기상대 하나)"""
     try:
         # 그래프 생성 스크립트 실행
         result = subprocess.run(
-            ['python3', 'aws_graph.py'],
+            ['python3', 'aws_graph.py', '--site', str(site)],
             capture_output=True,
             text=True
         )
@@ -312,6 +960,8 @@ def generate_weather_graph(days: int = 7):
             return {"message": "그래프 생성 완료", "path": "./graphs/"}
         else:
             raise HTTPException(status_code=500, detail=result.stderr)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -329,6 +979,28 @@ def get_graph_image(graph_type: str):
 
     return FileResponse(file_path, media_type="image/png")
 
+
+@app.get("/api/db/pool")
+async def get_pool_stats():
+    """DB 연결 풀 상태 (사용 중 연결 수, 획득 대기 시간, 대기 시간 초과/끊긴 연결 교체 횟수)"""
+    return db_pool.stats()
+
+
+@app.get("/api/cache")
+async def get_cache_stats():
+    """
+    latest/today/stats 응답 캐시 상태 (적중/실패 횟수와 적중률, 무효화 횟수, 변경 알림 수신 여부)
+    derived: 파생 지표 메모 항목 수와 적중/실패 횟수
+    """
+    return {**response_cache.stats(), "derived": derived_cache.stats()}
+
+
+@app.get("/api/stream")
+async def get_stream_stats():
+    """실시간 전송 상태 (구독자 수, 알림 처리용 조회 횟수, 보낸 행 수, 큐가 넘쳐 끊긴 구독자 수)"""
+    return broadcaster.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
 
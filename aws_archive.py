@@ -0,0 +1,60 @@
+from datetime import date
+import gzip
+import os
+
+
+DEFAULT_ARCHIVE_DIR = './archive'
+
+
+class RawArchive:
+    """
+    기상대 원본 응답(dspnet.aspx)을 날짜별 gzip 파일로 보관
+    경로: {root}/site={site}/dev={dev}/{YYYY}/{MM}/{YYYY-MM-DD}.txt.gz
+    같은 날을 다시 받으면 최신 응답으로 덮어씀 (하루치 응답은 누적되므로)
+    """
+
+    def __init__(self, root=DEFAULT_ARCHIVE_DIR, compresslevel=6):
+        self.root = root
+        self.compresslevel = compresslevel
+
+    def path_for(self, site, dev, day):
+        return os.path.join(self.root, f'site={site}', f'dev={dev}',
+                            f'{day.year:04d}', f'{day.month:02d}', f'{day.isoformat()}.txt.gz')
+
+    def save(self, text, site, dev, day):
+        path = self.path_for(site, dev, day)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # 쓰는 도중 중단되어도 기존 파일이 깨지지 않도록 임시 파일에 쓴 뒤 교체
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=self.compresslevel) as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        return path
+
+    def load(self, site, dev, day):
+        """보관된 응답 문자열 (없으면 None)"""
+        path = self.path_for(site, dev, day)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return f.read()
+
+    def days(self, site, dev, start_date=None, end_date=None):
+        """보관된 날짜 목록 (오름차순)"""
+        base = os.path.join(self.root, f'site={site}', f'dev={dev}')
+        found = []
+        for dirpath, _, filenames in os.walk(base):
+            for name in filenames:
+                if not name.endswith('.txt.gz'):
+                    continue
+                try:
+                    day = date.fromisoformat(name[:-len('.txt.gz')])
+                except ValueError:
+                    continue
+                if start_date and day < start_date:
+                    continue
+                if end_date and day > end_date:
+                    continue
+                found.append(day)
+        return sorted(found)
@@ -0,0 +1,135 @@
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+
+from aws_archive import RawArchive
+from aws_client import DEFAULT_SITE_ID, DEFAULT_DEV_ID, get_client
+from aws_postgre import get_db_connection, get_aws, bulk_save_to_db, ensure_partitions
+from aws_query import local_today
+from aws_schema import BACKFILL_CHECKPOINT_DDL
+
+
+# 기상대 데이터 수집 시작일
+DEFAULT_START_DATE = date(2023, 9, 26)
+
+_local = threading.local()
+_thread_conns = []
+
+
+def _thread_conn():
+    """작업 스레드마다 DB 연결 하나를 재사용"""
+    conn = getattr(_local, 'conn', None)
+    if conn is None or conn.closed:
+        conn = get_db_connection()
+        _local.conn = conn
+        _thread_conns.append(conn)
+    return conn
+
+
+def get_done_days(conn, site=DEFAULT_SITE_ID, dev=DEFAULT_DEV_ID):
+    """이미 적재가 끝난 날짜 집합"""
+    cur = conn.cursor()
+    cur.execute(BACKFILL_CHECKPOINT_DDL)
+    cur.execute("""
+        SELECT day FROM backfill_checkpoint
+        WHERE site_id = %s AND dev_id = %s
+    """, (site, dev))
+    done = {row[0] for row in cur.fetchall()}
+    conn.commit()
+    cur.close()
+    return done
+
+
+def mark_done(conn, day, row_count, site=DEFAULT_SITE_ID, dev=DEFAULT_DEV_ID):
+    cur = conn.cursor()
+    cur.execute("""
+        INSERT INTO backfill_checkpoint (site_id, dev_id, day, row_count)
+        VALUES (%s, %s, %s, %s)
+        ON CONFLICT (site_id, dev_id, day) DO UPDATE SET row_count = EXCLUDED.row_count, finished_at = NOW()
+    """, (site, dev, day, row_count))
+    conn.commit()
+    cur.close()
+
+
+def backfill_day(day, site=DEFAULT_SITE_ID, dev=DEFAULT_DEV_ID, archive=None):
+    """하루치 데이터를 받아 weather_data에 적재"""
+    data = get_aws(day.year, f"{day.month:02d}", f"{day.day:02d}", site=site, dev=dev, archive=archive)
+    conn = _thread_conn()
+    result = bulk_save_to_db(data, conn, site=site, dev=dev)
+
+    # 오늘은 아직 데이터가 쌓이는 중이므로 완료 처리하지 않음
+    if day < local_today():
+        mark_done(conn, day, len(data), site=site, dev=dev)
+
+    return result
+
+
+def backfill(start_date, end_date, workers=8, resume=True, site=DEFAULT_SITE_ID, dev=DEFAULT_DEV_ID,
+             archive=None):
+    conn = get_db_connection()
+    done = get_done_days(conn, site, dev) if resume else set()
+    ensure_partitions(conn, start_date, end_date)
+    conn.commit()
+    conn.close()
+
+    date_list = [start_date + timedelta(days=x) for x in range((end_date - start_date).days + 1)]
+    todo = [d for d in date_list if d not in done]
+    print(f"📅 [{site}-{dev}] {start_date} ~ {end_date}: 전체 {len(date_list)}일, 남은 {len(todo)}일 (동시 {workers}개)")
+
+    totals = {'inserted': 0, 'updated': 0, 'skipped': 0}
+    failed = []
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(backfill_day, d, site, dev, archive): d for d in todo}
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"❌ {day} 실패: {e}")
+                failed.append(day)
+                continue
+            for key in totals:
+                totals[key] += result[key]
+
+    while _thread_conns:
+        _thread_conns.pop().close()
+
+    elapsed = time.perf_counter() - started
+    finished = len(todo) - len(failed)
+    rate = finished / elapsed if elapsed > 0 else 0.0
+    stats = get_client().stats()
+    print(f"🎉 {finished}일 완료, {len(failed)}일 실패 / {elapsed:.1f}초 ({rate:.2f} days/s)")
+    print(f"   신규 {totals['inserted']}개 / 갱신 {totals['updated']}개 / 건너뜀 {totals['skipped']}개")
+    if 'mean_ms' in stats:
+        print(f"   기상대 요청 {stats['requests']}회 (재시도 {stats['retries']}회), "
+              f"평균 {stats['mean_ms']:.0f}ms / p95 {stats['p95_ms']:.0f}ms")
+    if failed:
+        print(f"   실패한 날짜는 다시 실행하면 이어서 처리됩니다: {', '.join(str(d) for d in sorted(failed))}")
+
+    return totals, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='기상대 과거 데이터 일괄 적재')
+    parser.add_argument('--start', default=DEFAULT_START_DATE.isoformat(), help='시작 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--end', default=local_today().isoformat(), help='종료 날짜 (YYYY-MM-DD)')
+    parser.add_argument('--workers', type=int, default=8, help='동시 요청 수')
+    parser.add_argument('--site', type=int, default=DEFAULT_SITE_ID, help='기상대 번호')
+    parser.add_argument('--dev', type=int, default=DEFAULT_DEV_ID, help='장비 번호')
+    parser.add_argument('--no-resume', action='store_true', help='체크포인트를 무시하고 전체 기간 다시 적재')
+    parser.add_argument('--archive', help='원본 응답을 gzip으로 보관할 경로 (미지정 시 보관 안 함)')
+    args = parser.parse_args()
+
+    start_date = datetime.strptime(args.start, "%Y-%m-%d").date()
+    end_date = datetime.strptime(args.end, "%Y-%m-%d").date()
+    archive = RawArchive(args.archive) if args.archive else None
+    backfill(start_date, end_date, workers=args.workers, resume=not args.no_resume, site=args.site, dev=args.dev,
+             archive=archive)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+import asyncio
+import json
+import time
+from collections import OrderedDict
+
+
+# 적재 트랜잭션이 weather_data를 바꾸면 커밋 시 이 채널로 NOTIFY
+CHANGE_CHANNEL = 'weather_data_changed'
+
+
+def notify_changed(cur, site, dev, first, last):
+    """
+    적재 트랜잭션 안에서 변경 알림 예약 (NOTIFY는 커밋될 때 전달되고 롤백되면 버려짐)
+    payload: {"site": .., "dev": .., "first": ISO 시각, "last": ISO 시각}
+    """
+    payload = json.dumps({'site': site, 'dev': dev, 'first': first.isoformat(), 'last': last.isoformat()})
+    cur.execute("SELECT pg_notify(%s, %s)", (CHANGE_CHANNEL, payload))
+
+
+class ResponseCache:
+    """
+    엔드포인트 + 파라미터 키로 조회 결과를 보관하는 프로세스 내 LRU 캐시 (이벤트 루프 안에서만 사용)
+    - max_entries를 넘으면 가장 오래 안 쓴 항목부터 제거
+    - 저장 후 ttl초가 지나면 만료 (변경 알림을 놓쳐도 이 시간 이상 오래된 값은 반환하지 않음)
+    - invalidate()는 전체 삭제. 조회 도중 무효화되면 그 결과는 저장하지 않음 (generation 비교)
+    """
+
+    def __init__(self, max_entries=256, ttl=60.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self.listening = False
+
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evicted = 0
+        self._invalidations = 0
+
+    def get(self, key):
+        """(찾았는지, 값)"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if time.monotonic() - stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return True, value
+            del self._entries[key]
+            self._expired += 1
+        self._misses += 1
+        return False, None
+
+    def put(self, key, value, generation):
+        """generation은 조회 시작 전 self.generation 값 (그사이 무효화됐으면 저장하지 않음)"""
+        if generation != self.generation:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._evicted += 1
+
+    async def get_or_load(self, key, load):
+        """캐시에 있으면 그 값, 없으면 await load() 결과를 저장해 반환"""
+        found, value = self.get(key)
+        if found:
+            return value
+        generation = self.generation
+        value = await load()
+        self.put(key, value, generation)
+        return value
+
+    def invalidate(self):
+        self._entries.clear()
+        self.generation += 1
+        self._invalidations += 1
+
+    def stats(self):
+        """항목 수, 적중/실패 횟수와 적중률, TTL 만료/LRU 제거/무효화 횟수, 변경 알림 수신 중인지"""
+        lookups = self._hits + self._misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'hits': self._hits,
+            'misses': self._misses,
+            'hit_ratio': self._hits / lookups if lookups else None,
+            'expired': self._expired,
+            'evicted': self._evicted,
+            'invalidations': self._invalidations,
+            'listening': self.listening,
+        }
+
+
+async def listen_for_changes(cache, retry_interval=5.0, on_change=None, **connect_kwargs):
+    """
+    CHANGE_CHANNEL을 LISTEN하면서 알림마다 cache 무효화 (취소될 때까지 실행)
+    on_change가 있으면 알림 payload(dict)로 호출 (이벤트 루프를 막지 않는 함수)
+    연결이 끊기면 retry_interval초 뒤 다시 연결하고, 그동안 놓친 알림이 있을 수 있으므로
+    다시 연결할 때도 무효화하고 on_change(None) 호출
+    """
+    import psycopg
+
+    while True:
+        try:
+            async with await psycopg.AsyncConnection.connect(autocommit=True, **connect_kwargs) as conn:
+                await conn.execute(f"LISTEN {CHANGE_CHANNEL}")
+                cache.invalidate()
+                cache.listening = True
+                if on_change is not None:
+                    on_change(None)
+                async for notify in conn.notifies():
+                    cache.invalidate()
+                    if on_change is not None:
+                        on_change(json.loads(notify.payload))
+        except psycopg.Error as e:
+            print(f"⚠️ 변경 알림 연결 끊김, {retry_interval}초 후 재연결: {e}")
+        finally:
+            cache.listening = False
+        await asyncio.sleep(retry_interval)
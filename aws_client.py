@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import deque
+
+import backoff
+import requests
+from requests.adapters import HTTPAdapter
+
+
+STATION_URL = "http://203.239.47.148:8080/dspnet.aspx"
+
+# 기존 단일 기상대의 기상대/장비 번호
+DEFAULT_SITE_ID = 85
+DEFAULT_DEV_ID = 1
+
+# 재시도 대상: 연결 실패, 타임아웃, 5xx 응답
+RETRY_ERRORS = (requests.ConnectionError, requests.Timeout, requests.HTTPError)
+
+
+def _is_client_error(e):
+    """4xx 응답은 재시도해도 같은 결과이므로 바로 포기"""
+    response = getattr(e, 'response', None)
+    return response is not None and response.status_code < 500
+
+
+class SiteRateLimiter:
+    """기상대(site)별 최소 요청 간격 유지 (여러 스레드가 같은 기상대를 동시에 두드리지 않도록)"""
+
+    def __init__(self, min_intervals=None, default_interval=0.0):
+        self.min_intervals = dict(min_intervals or {})
+        self.default_interval = default_interval
+        self._lock = threading.Lock()
+        self._next_allowed = {}
+
+    def wait(self, site):
+        interval = self.min_intervals.get(site, self.default_interval)
+        if interval <= 0:
+            return
+
+        # 다음 요청 가능 시각을 먼저 예약한 뒤 잠금 밖에서 대기
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_allowed.get(site, now))
+            self._next_allowed[site] = slot + interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class StationClient:
+    """
+    기상대 dspnet.aspx 요청용 공유 HTTP 클라이언트
+    keep-alive 세션 재사용, 연결/읽기 타임아웃, 지터가 들어간 지수 백오프 재시도, 요청별 지연 통계
+    """
+
+    def __init__(self, base_url=STATION_URL, connect_timeout=5, read_timeout=30,
+                 max_tries=5, max_time=120, pool_size=16, stats_window=1000, rate_limiter=None):
+        self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_tries = max_tries
+        self.max_time = max_time
+        self.rate_limiter = rate_limiter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=stats_window)
+        self._requests = 0
+        self._errors = 0
+        self._retries = 0
+
+    def fetch_day(self, year, month, day, site=DEFAULT_SITE_ID, dev=DEFAULT_DEV_ID):
+        """하루치 원본 응답 문자열"""
+        params = {'Site': site, 'Dev': dev, 'Year': year, 'Mon': month, 'Day': day}
+        request = backoff.on_exception(
+            backoff.expo,
+            RETRY_ERRORS,
+            max_tries=self.max_tries,
+            max_time=self.max_time,
+            jitter=backoff.full_jitter,
+            giveup=_is_client_error,
+            on_backoff=self._on_backoff,
+        )(self._get)
+        return request(params).text
+
+    def _get(self, params):
+        if self.rate_limiter is not None:
+            self.rate_limiter.wait(params['Site'])
+
+        started = time.perf_counter()
+        try:
+            response = self.session.get(self.base_url, params=params, timeout=self.timeout)
+            response.raise_for_status()
+        except requests.RequestException:
+            with self._lock:
+                self._requests += 1
+                self._errors += 1
+            raise
+
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._requests += 1
+            self._latencies.append(elapsed)
+        return response
+
+    def _on_backoff(self, details):
+        with self._lock:
+            self._retries += 1
+        print(f"⏳ 기상대 요청 재시도 {details['tries']}회 ({details['wait']:.1f}초 대기)")
+
+    def stats(self):
+        """요청 수, 실패/재시도 횟수, 최근 요청의 지연 시간 통계 (ms)"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            result = {
+                'requests': self._requests,
+                'errors': self._errors,
+                'retries': self._retries,
+            }
+
+        if latencies:
+            result.update({
+                'mean_ms': sum(latencies) / len(latencies) * 1000,
+                'p50_ms': latencies[len(latencies) // 2] * 1000,
+                'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000,
+                'max_ms': latencies[-1] * 1000,
+            })
+        return result
+
+    def close(self):
+        self.session.close()
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def get_client():
+    """프로세스 전체에서 공유하는 기본 클라이언트"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = StationClient()
+        return _default_client
@@ -0,0 +1,196 @@
+from collections import OrderedDict
+from datetime import date, timedelta
+
+import numpy as np
+
+
+# 포화 수증기압 (FAO-56 식 11, Tetens) 계수
+TETENS_A = 17.27
+TETENS_B = 237.3
+
+# 일사량(W/m², 전천 단파) -> 광합성 유효 광량자속 밀도(PPFD, µmol/m²/s) 환산 계수
+# (단파 중 PAR 비율 약 0.45 x 태양광 PAR 4.57 µmol/J)
+SW_TO_PPFD = 2.02
+
+# 분 단위 관측 기준 하루 행 수 (DLI 관측 비율 계산용)
+MINUTES_PER_DAY = 1440
+
+_EPOCH_DATE = date(1970, 1, 1)
+
+DERIVED_COLUMNS = [
+    'site_id', 'dev_id', 'date', 'row_count',
+    'temp_mean', 'temp_min', 'temp_max', 'humid_mean',
+    'vpd_mean', 'vpd_max', 'dew_point_mean', 'gdd', 'dli', 'light_coverage',
+]
+
+
+def saturation_vapour_pressure(temp):
+    """기온(°C) -> 포화 수증기압(kPa)"""
+    temp = np.asarray(temp, dtype=np.float64)
+    return 0.6108 * np.exp(TETENS_A * temp / (temp + TETENS_B))
+
+
+def vapour_pressure_deficit(temp, humid):
+    """기온(°C), 상대습도(%) -> 수증기압 포차 VPD(kPa)"""
+    humid = np.clip(np.asarray(humid, dtype=np.float64), 0, 100)
+    return saturation_vapour_pressure(temp) * (1 - humid / 100)
+
+
+def dew_point(temp, humid):
+    """기온(°C), 상대습도(%) -> 이슬점(°C) (포화 수증기압과 같은 계수의 Magnus 식, 습도 0은 0.1%로)"""
+    temp = np.asarray(temp, dtype=np.float64)
+    humid = np.clip(np.asarray(humid, dtype=np.float64), 0.1, 100)
+    gamma = np.log(humid / 100) + TETENS_A * temp / (temp + TETENS_B)
+    return TETENS_B * gamma / (TETENS_A - gamma)
+
+
+def growing_degree_days(temp_min, temp_max, base_temp=10.0, upper_temp=30.0):
+    """
+    일 최저/최고 기온 -> 생육 도일 GDD(°C·일)
+    최고 기온은 upper_temp, 최저 기온은 base_temp로 자른 뒤 평균에서 base_temp를 뺌 (0 미만은 0)
+    """
+    temp_max = np.minimum(np.asarray(temp_max, dtype=np.float64), upper_temp)
+    temp_min = np.maximum(np.asarray(temp_min, dtype=np.float64), base_temp)
+    return np.maximum((temp_max + temp_min) / 2 - base_temp, 0)
+
+
+def ppfd(radn):
+    """일사량(W/m²) -> PPFD(µmol/m²/s)"""
+    return np.asarray(radn, dtype=np.float64) * SW_TO_PPFD
+
+
+def daily_light_integral(mean_ppfd):
+    """하루 평균 PPFD(µmol/m²/s) -> 일 적산 광량 DLI(mol/m²/일)"""
+    return np.asarray(mean_ppfd, dtype=np.float64) * 86400 / 1e6
+
+
+def _group_stats(values, starts):
+    """그룹(시작 인덱스 starts)별 NaN 제외 (개수, 평균, 최소, 최대)"""
+    valid = ~np.isnan(values)
+    count = np.add.reduceat(valid.astype(np.int64), starts)
+    total = np.add.reduceat(np.where(valid, values, 0.0), starts)
+    low = np.minimum.reduceat(np.where(valid, values, np.inf), starts)
+    high = np.maximum.reduceat(np.where(valid, values, -np.inf), starts)
+
+    empty = count == 0
+    mean = total / np.maximum(count, 1)
+    for result in (mean, low, high):
+        result[empty] = np.nan
+    return count, mean, low, high
+
+
+def daily_metrics(site, dev, day, temp, humid, radn, base_temp=10.0, upper_temp=30.0):
+    """
+    (site, dev, 시각) 순으로 정렬된 관측 컬럼 배열 -> 기상대/장비/날짜별 지표 (DERIVED_COLUMNS 키의 컬럼 배열)
+    day는 1970-01-01부터의 일 수(정수), 결측값은 NaN
+    DLI는 일사량이 있는 분의 평균 PPFD로 하루를 채워 계산하고, 관측 비율은 light_coverage
+    """
+    site = np.asarray(site, dtype=np.int64)
+    dev = np.asarray(dev, dtype=np.int64)
+    day = np.asarray(day, dtype=np.int64)
+    temp = np.asarray(temp, dtype=np.float64)
+    humid = np.asarray(humid, dtype=np.float64)
+    radn = np.asarray(radn, dtype=np.float64)
+    if len(day) == 0:
+        return {col: np.array([]) for col in DERIVED_COLUMNS}
+
+    boundary = np.empty(len(day), dtype=bool)
+    boundary[0] = True
+    boundary[1:] = (site[1:] != site[:-1]) | (dev[1:] != dev[:-1]) | (day[1:] != day[:-1])
+    starts = np.flatnonzero(boundary)
+
+    _, temp_mean, temp_min, temp_max = _group_stats(temp, starts)
+    _, humid_mean, _, _ = _group_stats(humid, starts)
+    _, vpd_mean, _, vpd_max = _group_stats(vapour_pressure_deficit(temp, humid), starts)
+    _, dew_point_mean, _, _ = _group_stats(dew_point(temp, humid), starts)
+    light_count, ppfd_mean, _, _ = _group_stats(ppfd(radn), starts)
+
+    return {
+        'site_id': site[starts],
+        'dev_id': dev[starts],
+        'date': day[starts],
+        'row_count': np.diff(np.append(starts, len(day))),
+        'temp_mean': temp_mean,
+        'temp_min': temp_min,
+        'temp_max': temp_max,
+        'humid_mean': humid_mean,
+        'vpd_mean': vpd_mean,
+        'vpd_max': vpd_max,
+        'dew_point_mean': dew_point_mean,
+        'gdd': growing_degree_days(temp_min, temp_max, base_temp, upper_temp),
+        'dli': daily_light_integral(ppfd_mean),
+        'light_coverage': light_count / MINUTES_PER_DAY,
+    }
+
+
+def metric_rows(metrics):
+    """daily_metrics 결과 -> DERIVED_COLUMNS 순서의 튜플 행 (date는 datetime.date, NaN은 None)"""
+    columns = []
+    for col in DERIVED_COLUMNS:
+        values = metrics[col]
+        if col == 'date':
+            columns.append([_EPOCH_DATE + timedelta(days=int(value)) for value in values])
+        elif values.dtype.kind == 'f':
+            columns.append([None if np.isnan(value) else float(value) for value in values])
+        else:
+            columns.append([int(value) for value in values])
+    return list(zip(*columns))
+
+
+def daily_metric_rows(rows, base_temp=10.0, upper_temp=30.0):
+    """
+    (site_id, dev_id, 일 수, temp, humid, radn) 튜플 행 (기상대/장비/시각 순) -> DERIVED_COLUMNS 튜플 행
+    None은 NaN으로 바꿔 한 번에 배열로 변환
+    """
+    if not rows:
+        return []
+    data = np.array(rows, dtype=np.float64)
+    return metric_rows(daily_metrics(*data.T, base_temp=base_temp, upper_temp=upper_temp))
+
+
+class DerivedDayCache:
+    """
+    마감된 날의 일 단위 지표 행을 (날짜, 조회 조건) 키로 보관하는 LRU 메모 (이벤트 루프 안에서만 사용)
+    적재 알림이 오면 해당 기상대의 해당 날짜 항목만 무효화. 계산 도중 무효화되면 저장하지 않음 (generation 비교)
+    """
+
+    def __init__(self, max_entries=20000):
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, day, key):
+        """(찾았는지, 행 목록)"""
+        rows = self._entries.get((day, key))
+        if rows is None:
+            self._misses += 1
+            return False, None
+        self._entries.move_to_end((day, key))
+        self._hits += 1
+        return True, rows
+
+    def put(self, day, key, rows, generation):
+        if generation != self.generation:
+            return
+        self._entries[day, key] = rows
+        self._entries.move_to_end((day, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, change):
+        """listen_for_changes 알림 payload (None이면 전체 삭제). key[0]은 조회 조건의 기상대(None이면 전체)"""
+        self.generation += 1
+        if change is None:
+            self._entries.clear()
+            return
+        first = date.fromisoformat(change['first'][:10])
+        last = date.fromisoformat(change['last'][:10])
+        stale = [entry for entry in self._entries
+                 if first <= entry[0] <= last and entry[1][0] in (None, change['site'])]
+        for entry in stale:
+            del self._entries[entry]
+
+    def stats(self):
+        return {'entries': len(self._entries), 'hits': self._hits, 'misses': self._misses}
@@ -0,0 +1,67 @@
+import re
+from datetime import datetime, timedelta
+
+import numpy as np
+
+
+RESOLUTION_PATTERN = re.compile(r'^(\d+)([mhd])$')
+RESOLUTION_UNITS = {'m': 'minutes', 'h': 'hours', 'd': 'days'}
+
+# LTTB 적용 기준 센서 (aws_graph에서 그리는 값)
+LTTB_COLUMNS = ['temp', 'humid', 'radn']
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def parse_resolution(value):
+    """'15m', '1h', '1d' -> timedelta (형식이 틀리거나 1분 미만이면 ValueError)"""
+    match = RESOLUTION_PATTERN.match(value or '')
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"resolution 형식이 올바르지 않습니다: {value} (예: 15m, 1h, 1d)")
+    return timedelta(**{RESOLUTION_UNITS[match.group(2)]: int(match.group(1))})
+
+
+def lttb_indices(x, y, n):
+    """
+    Largest-Triangle-Three-Buckets: (x, y) 점들 중 선 모양을 가장 잘 보존하는 n개 점의 인덱스 (x 오름차순)
+    첫/마지막 점은 항상 포함하고, 나머지 구간을 n-2개 버킷으로 나눠 버킷마다
+    직전에 고른 점과 다음 버킷 평균점이 이루는 삼각형 넓이가 가장 큰 점 하나를 고름
+    """
+    length = len(x)
+    if n >= length:
+        return np.arange(length)
+    if n < 3:
+        return np.array([0, length - 1][:max(n, 0)])
+
+    every = (length - 2) / (n - 2)
+    edges = np.empty(n, dtype=np.int64)
+    edges[:n - 1] = np.floor(np.arange(n - 1) * every).astype(np.int64) + 1
+    edges[n - 1] = length
+
+    indices = np.empty(n, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = length - 1
+    a = 0
+    for i in range(n - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < n else length
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(np.argmax(area))
+        indices[i + 1] = a
+    return indices
+
+
+def lttb_select(stamps, columns, n):
+    """
+    시각 stamps(오름차순 datetime)와 센서별 값 목록 columns(None은 결측)에 각각 LTTB를 적용해 고른 행 인덱스의 합집합
+    센서마다 값이 있는 점 중 최대 n개를 보존하므로 결과 행 수는 최대 n x 센서 수
+    """
+    x = np.fromiter(((stamp - _EPOCH).total_seconds() for stamp in stamps), np.float64, len(stamps))
+    selected = set()
+    for values in columns:
+        y = np.asarray(values, dtype=np.float64)
+        valid = np.flatnonzero(~np.isnan(y))
+        selected.update(valid[lttb_indices(x[valid], y[valid], n)].tolist())
+    return sorted(selected)
@@ -0,0 +1,163 @@
+import csv
+import io
+
+from aws_http import json_dumps
+
+
+# 내보내기 컬럼 (weather_data 순서)
+EXPORT_COLUMNS = [
+    'site_id', 'dev_id', 'timestamp', 'temp', 'humid', 'radn', 'wind_degree', 'wind', 'rainfall', 'battery',
+    'rain_increment', 'qc_flags',
+]
+
+EXPORT_MEDIA_TYPES = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+
+class CsvEncoder:
+    """행 묶음(튜플 목록) -> CSV 바이트 (첫 묶음 앞에 헤더)"""
+
+    def __init__(self, columns=EXPORT_COLUMNS):
+        self.columns = columns
+
+    def header(self):
+        return self._write([self.columns])
+
+    def encode(self, rows):
+        return self._write(rows)
+
+    def finish(self):
+        return b''
+
+    @staticmethod
+    def _write(rows):
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows(rows)
+        return buffer.getvalue().encode('utf-8')
+
+
+class NdjsonEncoder:
+    """행 묶음 -> 한 줄에 JSON 객체 하나 (orjson, 시각은 ISO 문자열)"""
+
+    def __init__(self, columns=EXPORT_COLUMNS):
+        self.columns = columns
+
+    def header(self):
+        return b''
+
+    def encode(self, rows):
+        return b''.join(json_dumps(dict(zip(self.columns, row))) + b'\n' for row in rows)
+
+    def finish(self):
+        return b''
+
+
+class _ChunkSink:
+    """ParquetWriter가 쓴 바이트를 모아 두었다가 꺼내 가는 파일 객체"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def arrow_schema(columns):
+    """weather_data/버킷 집계/일 단위 파생 지표 컬럼 -> Arrow 스키마 (나머지 센서 값은 REAL과 같은 float32)"""
+    import pyarrow as pa
+
+    types = {
+        'site_id': pa.int32(),
+        'dev_id': pa.int32(),
+        'timestamp': pa.timestamp('s'),
+        'bucket': pa.timestamp('s'),
+        'date': pa.date32(),
+        'qc_flags': pa.int16(),
+        'row_count': pa.int32(),
+    }
+    return pa.schema([(col, types.get(col, pa.float32())) for col in columns])
+
+
+def arrow_table(schema, rows):
+    """튜플 행 목록 -> 컬럼별 Arrow 배열로 만든 Table"""
+    import pyarrow as pa
+
+    values = list(zip(*rows)) or [()] * len(schema)
+    return pa.Table.from_arrays(
+        [pa.array(values[i], type=field.type) for i, field in enumerate(schema)],
+        schema=schema,
+    )
+
+
+class ParquetEncoder:
+    """행 묶음 하나를 Parquet row group 하나로 (pyarrow 필요)"""
+
+    def __init__(self, columns=EXPORT_COLUMNS):
+        import pyarrow.parquet as pq
+
+        self.columns = columns
+        self._schema = arrow_schema(columns)
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, self._schema, compression='zstd')
+
+    def header(self):
+        return b''
+
+    def encode(self, rows):
+        self._writer.write_table(arrow_table(self._schema, rows))
+        return self._sink.drain()
+
+    def finish(self):
+        self._writer.close()
+        return self._sink.drain()
+
+
+ENCODERS = {
+    'csv': CsvEncoder,
+    'ndjson': NdjsonEncoder,
+    'parquet': ParquetEncoder,
+}
+
+
+# 목록 조회 응답 형식 (rows는 기존 행 단위 JSON)
+LIST_FORMATS = ['rows', 'columnar', 'arrow']
+
+ARROW_MEDIA_TYPE = 'application/vnd.apache.arrow.stream'
+
+
+def encode_columnar(columns, rows):
+    """튜플 행 목록 -> {컬럼: [값, ...]} JSON (행마다 dict/모델을 만들지 않음, orjson이 시각/날짜를 ISO 문자열로)"""
+    values = list(zip(*rows)) or [()] * len(columns)
+    return json_dumps({col: list(column_values) for col, column_values in zip(columns, values)})
+
+
+def encode_arrow(columns, rows):
+    """튜플 행 목록 -> Arrow IPC stream 바이트 (pyarrow 필요)"""
+    import pyarrow as pa
+
+    schema = arrow_schema(columns)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        writer.write_table(arrow_table(schema, rows))
+    return sink.getvalue().to_pybytes()
@@ -3,8 +3,13 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
 from datetime import datetime, timedelta
+import argparse
 import os
 
+from aws_client import DEFAULT_SITE_ID
+from aws_query import day_bounds, local_now, local_today, where_clause
+from aws_rollup import series_query
+
 
 def get_db_connection():
     return psycopg2.connect(
@@ -15,26 +20,23 @@ def get_db_connection():
     )
 
 
-def get_weather_data(start_date=None, end_date=None, days=7):
-    """Get weather data from PostgreSQL"""
+def get_weather_data(start_date=None, end_date=None, days=7, site=DEFAULT_SITE_ID):
+    """Get one station's weather data from PostgreSQL"""
     conn = get_db_connection()
 
     if start_date and end_date:
-        query = """
-            SELECT timestamp, temp, humid, radn
-            FROM weather_data
-            WHERE DATE(timestamp) BETWEEN %s AND %s
-            ORDER BY timestamp
-        """
-        df = pd.read_sql_query(query, conn, params=(start_date, end_date))
+        bounds = day_bounds(start_date, end_date)
     else:
-        query = """
-            SELECT timestamp, temp, humid, radn
-            FROM weather_data
-            WHERE timestamp >= NOW() - INTERVAL '%s days'
-            ORDER BY timestamp
-        """
-        df = pd.read_sql_query(query, conn, params=(days,))
+        bounds = (local_now() - timedelta(days=days), None)
+    where_sql, params = where_clause(*bounds, site=site)
+
+    query = f"""
+        SELECT timestamp, temp, humid, radn, rain_increment
+        FROM weather_data
+        {where_sql}
+        ORDER BY timestamp
+    """
+    df = pd.read_sql_query(query, conn, params=params)
 
     conn.close()
     df['timestamp'] = pd.to_datetime(df['timestamp'])
@@ -42,16 +44,30 @@ def get_weather_data(start_date=None, end_date=None, days=7):
     return df
 
 
-def get_today_data():
-    """Get today's weather data only"""
+def get_daily_summary(days=7, site=DEFAULT_SITE_ID):
+    """Get one station's daily averages and rainfall totals from the daily rollup table"""
+    conn = get_db_connection()
+    today = local_today()
+    query, params = series_query('daily', *day_bounds(today - timedelta(days=days), today), site=site)
+    daily_df = pd.read_sql_query(query, conn, params=params)
+    conn.close()
+    daily_df = daily_df.rename(columns={'bucket': 'date'})
+    daily_df['date'] = pd.to_datetime(daily_df['date'])
+
+    return daily_df
+
+
+def get_today_data(site=DEFAULT_SITE_ID):
+    """Get one station's weather data for today only"""
     conn = get_db_connection()
-    query = """
+    where_sql, params = where_clause(*day_bounds(local_today()), site=site)
+    query = f"""
         SELECT timestamp, temp, humid, radn
         FROM weather_data
-        WHERE DATE(timestamp) = CURRENT_DATE
+        {where_sql}
         ORDER BY timestamp
     """
-    df = pd.read_sql_query(query, conn)
+    df = pd.read_sql_query(query, conn, params=params)
     conn.close()
     df['timestamp'] = pd.to_datetime(df['timestamp'])
 
@@ -246,19 +262,9 @@ def create_combined_graph(df, output_path='weather_combined.png', title='Smart F
     plt.close()
 
 
-def create_daily_summary_graph(df, output_path='weather_daily.png', title='Daily Weather Summary'):
-    """Create daily average summary as line graphs"""
-    df['date'] = df['timestamp'].dt.date
-    daily_df = df.groupby('date').agg({
-        'temp': 'mean',
-        'humid': 'mean',
-        'radn': 'mean'
-    }).reset_index()
-
-    # Convert date to datetime for proper plotting
-    daily_df['date'] = pd.to_datetime(daily_df['date'])
-
-    fig, axes = plt.subplots(3, 1, figsize=(12, 10))
+def create_daily_summary_graph(daily_df, output_path='weather_daily.png', title='Daily Weather Summary'):
+    """Create daily average summary as line graphs (daily_df from get_daily_summary)"""
+    fig, axes = plt.subplots(4, 1, figsize=(12, 13))
     fig.suptitle(title, fontsize=16, fontweight='bold')
 
     # Temperature
@@ -283,10 +289,17 @@ def create_daily_summary_graph(df, output_path='weather_daily.png', title='Daily
                  label='Avg Solar Radiation')
     axes[2].fill_between(daily_df['date'], daily_df['radn'], alpha=0.3, color='#f39c12')
     axes[2].set_ylabel('Solar Radiation (W/m²)', fontsize=12, fontweight='bold')
-    axes[2].set_xlabel('Date', fontsize=12, fontweight='bold')
     axes[2].grid(True, alpha=0.3)
     axes[2].legend()
 
+    # Rainfall (daily total of per-interval increments)
+    axes[3].bar(daily_df['date'], daily_df['rain_total'], color='#2c3e50', alpha=0.7, width=0.6,
+                label='Total Rainfall')
+    axes[3].set_ylabel('Rainfall (mm)', fontsize=12, fontweight='bold')
+    axes[3].set_xlabel('Date', fontsize=12, fontweight='bold')
+    axes[3].grid(True, alpha=0.3)
+    axes[3].legend()
+
     # Date format
     for ax in axes:
         ax.xaxis.set_major_formatter(mdates.DateFormatter('%m-%d'))
@@ -299,15 +312,19 @@ def create_daily_summary_graph(df, output_path='weather_daily.png', title='Daily
 
 
 def main():
+    parser = argparse.ArgumentParser(description='AWS weather graphs')
+    parser.add_argument('--site', type=int, default=DEFAULT_SITE_ID, help='station (site) number to plot')
+    args = parser.parse_args()
+
     output_dir = './graphs'
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    print("📊 Generating weather graphs...")
+    print(f"📊 Generating weather graphs for site {args.site}...")
 
     # 1. Today's data
     print("\n📅 Generating today's graphs...")
-    today_df = get_today_data()
+    today_df = get_today_data(site=args.site)
     if not today_df.empty:
         create_today_graph(today_df, output_path=f'{output_dir}/weather_today.png')
         create_today_combined_graph(today_df, output_path=f'{output_dir}/weather_today_combined.png')
@@ -316,7 +333,7 @@ def main():
 
     # 2. Last 7 days data
     print("\n📅 Generating 7-day graphs...")
-    df = get_weather_data(days=7)
+    df = get_weather_data(days=7, site=args.site)
 
     if df.empty:
         print("❌ No data available for last 7 days")
@@ -338,7 +355,7 @@ def main():
     )
 
     create_daily_summary_graph(
-        df,
+        get_daily_summary(days=7, site=args.site),
         output_path=f'{output_dir}/weather_daily.png',
         title='Daily Weather Summary'
     )
@@ -0,0 +1,171 @@
+import json
+import zlib
+
+from fastapi.encoders import jsonable_encoder
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def json_dumps(content):
+    """orjson으로 JSON 바이트 (orjson이 없으면 json 모듈). datetime은 ISO 문자열, NaN은 null"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class FastJSONResponse(Response):
+    """
+    orjson으로 바로 직렬화하는 JSON 응답
+    DB 행(dict/datetime)을 pydantic 모델로 다시 검증하지 않고 그대로 인코딩
+    """
+
+    media_type = "application/json"
+
+    def render(self, content):
+        return json_dumps(content)
+
+
+# 이미 압축된 형식은 다시 압축하지 않음
+COMPRESSED_MEDIA_TYPES = ('image/', 'application/vnd.apache.parquet', 'application/zip', 'application/gzip')
+
+
+class _GzipEncoder:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+def negotiate_encoding(accept_encoding):
+    """Accept-Encoding -> 'br'(brotli 설치 시) / 'gzip' / None (q=0은 거부로 처리)"""
+    accepted = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    wildcard = accepted.get('*', 0.0)
+    if brotli is not None and accepted.get('br', wildcard) > 0:
+        return 'br'
+    if accepted.get('gzip', wildcard) > 0:
+        return 'gzip'
+    return None
+
+
+class CompressionMiddleware:
+    """
+    Accept-Encoding에 따라 br 또는 gzip으로 응답 본문 압축 (ASGI 미들웨어)
+    - 한 번에 보내는 본문은 minimum_size 바이트 미만이면 그대로
+    - 스트리밍 응답은 조각마다 flush해서 클라이언트가 바로 받을 수 있게 압축
+    - Content-Encoding이 이미 있거나 압축된 형식(이미지/Parquet 등)은 그대로
+    """
+
+    def __init__(self, app, minimum_size=1024, gzip_level=6, brotli_quality=4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get('accept-encoding', ''))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(self, encoding, send))
+
+    def encoder(self, encoding):
+        if encoding == 'br':
+            return _BrotliEncoder(self.brotli_quality)
+        return _GzipEncoder(self.gzip_level)
+
+
+class _CompressingSend:
+    """응답 시작 메시지를 첫 본문을 볼 때까지 보류했다가 압축 여부를 정해 전달"""
+
+    def __init__(self, middleware, encoding, send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.send = send
+        self.start = None
+        self.encoder = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message['type'] == 'http.response.start':
+            self.start = message
+            headers = Headers(raw=message['headers'])
+            media_type = headers.get('content-type', '')
+            self.passthrough = ('content-encoding' in headers
+                                or media_type.startswith(COMPRESSED_MEDIA_TYPES))
+            return
+        if message['type'] != 'http.response.body':
+            await self.send(message)
+            return
+
+        body = message.get('body', b'')
+        more_body = message.get('more_body', False)
+
+        if self.start is not None:
+            start, self.start = self.start, None
+            if self.passthrough or (not more_body and len(body) < self.middleware.minimum_size):
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            self.encoder = self.middleware.encoder(self.encoding)
+            headers = MutableHeaders(raw=start['headers'])
+            headers['Content-Encoding'] = self.encoding
+            headers.add_vary_header('Accept-Encoding')
+            if more_body:
+                del headers['Content-Length']
+            else:
+                body = self.encoder.compress(body) + self.encoder.finish()
+                headers['Content-Length'] = str(len(body))
+                await self.send(start)
+                await self.send({'type': 'http.response.body', 'body': body})
+                return
+            await self.send(start)
+
+        if self.passthrough:
+            await self.send(message)
+            return
+
+        body = self.encoder.compress(body)
+        if not more_body:
+            body += self.encoder.finish()
+        await self.send({'type': 'http.response.body', 'body': body, 'more_body': more_body})
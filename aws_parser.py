@@ -0,0 +1,91 @@
+from datetime import datetime
+import io
+
+import numpy as np
+import pandas as pd
+
+
+# dspnet.aspx 응답에서 사용하는 열 번호 -> 컬럼 이름
+COLUMN_INDEX = {
+    'timestamp': 0,
+    'temp': 1,
+    'humid': 2,
+    'radn': 6,
+    'wind_degree': 7,
+    'wind': 13,
+    'rainfall': 14,
+    'battery': 16,
+}
+
+WEATHER_COLUMNS = list(COLUMN_INDEX)
+VALUE_COLUMNS = WEATHER_COLUMNS[1:]
+
+# 한 행의 필드 수 (17개 값 + 행 끝 쉼표 뒤의 빈 필드)
+FIELD_COUNT = 18
+
+# 시각은 문자열, 나머지는 float64로 바로 읽음
+_TYPED_DTYPE = {i: ('str' if col == 'timestamp' else 'float64') for col, i in COLUMN_INDEX.items()}
+
+
+def empty_frame():
+    """컬럼 타입이 지정된 빈 DataFrame"""
+    frame = pd.DataFrame({col: np.array([], dtype='float64') for col in VALUE_COLUMNS})
+    frame.insert(0, 'timestamp', pd.to_datetime(np.array([], dtype='datetime64[ns]')))
+    return frame
+
+
+def lines_after(lines, after):
+    """시간순으로 정렬된 원본 행 중 after 이후의 행만 반환 (뒤에서부터 탐색)"""
+    start = len(lines)
+    while start > 0:
+        stamp = lines[start - 1].split(',', 1)[0].strip()
+        try:
+            if datetime.fromisoformat(stamp) <= after:
+                break
+        except ValueError:
+            pass
+        start -= 1
+    return lines[start:]
+
+
+def parse_payload(text, after=None):
+    """
+    dspnet.aspx 응답 문자열을 필요한 8개 열만 골라 타입이 지정된 DataFrame으로 변환
+    - 행 끝의 빈 필드는 읽지 않고, 시각을 읽을 수 없는 행은 버림
+    - 숫자가 아닌 값이나 잘린 행의 빠진 값은 NaN
+    - after 지정 시 그 이후 행만 파싱
+    """
+    if after is not None:
+        lines = lines_after(text.strip().splitlines(), after)
+        if not lines:
+            return empty_frame()
+        text = '\n'.join(lines)
+
+    if not text.strip():
+        return empty_frame()
+
+    try:
+        df = _read_columns(text, dtype=_TYPED_DTYPE)
+    except ValueError:
+        # 숫자가 아닌 값이 섞인 응답: 문자열로 읽은 뒤 열 단위로 변환
+        df = _read_columns(text, dtype='str')
+        for i in df.columns[1:]:
+            df[i] = pd.to_numeric(df[i], errors='coerce')
+    df.columns = WEATHER_COLUMNS
+
+    df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', errors='coerce')
+    df = df[df['timestamp'].notna()].reset_index(drop=True)
+
+    return df
+
+
+def _read_columns(text, dtype):
+    return pd.read_csv(
+        io.StringIO(text),
+        header=None,
+        names=range(FIELD_COUNT),
+        usecols=list(COLUMN_INDEX.values()),
+        dtype=dtype,
+        on_bad_lines='skip',
+        engine='c',
+    )
@@ -0,0 +1,98 @@
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+
+import psycopg_pool
+from psycopg.rows import dict_row
+
+
+class PoolTimeout(Exception):
+    """acquire_timeout 안에 빈 연결을 얻지 못함"""
+
+
+class AsyncDatabasePool:
+    """
+    aws_api용 비동기 PostgreSQL 연결 풀 (psycopg3 AsyncConnectionPool 기반)
+    - 연결은 autocommit, 행은 dict로 반환
+    - 연결이 모두 사용 중이면 acquire_timeout초까지 기다린 뒤 PoolTimeout
+    - health_check_interval초 이상 쉬었던 연결은 꺼낼 때 SELECT 1로 확인하고, 끊겼으면 풀이 버리고 다른 연결 사용
+    open()/close()는 이벤트 루프 안에서 호출
+    """
+
+    def __init__(self, min_size=2, max_size=20, acquire_timeout=5.0, health_check_interval=30.0,
+                 stats_window=1000, **connect_kwargs):
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.health_check_interval = health_check_interval
+
+        self._pool = psycopg_pool.AsyncConnectionPool(
+            kwargs={**connect_kwargs, 'autocommit': True, 'row_factory': dict_row},
+            min_size=min_size,
+            max_size=max_size,
+            timeout=acquire_timeout,
+            check=self._check,
+            reset=self._mark_used,
+            open=False,
+        )
+
+        self._last_used = weakref.WeakKeyDictionary()
+        self._waits = deque(maxlen=stats_window)
+        self._acquired = 0
+        self._timeouts = 0
+
+    async def open(self):
+        await self._pool.open(wait=True)
+
+    async def _check(self, conn):
+        """최근에 쓴 연결은 건너뛰고, 오래 쉬었던 연결만 SELECT 1 확인 (실패하면 풀이 버리고 다른 연결 사용)"""
+        last_used = self._last_used.get(conn)
+        if last_used is not None and time.monotonic() - last_used < self.health_check_interval:
+            return
+        await psycopg_pool.AsyncConnectionPool.check_connection(conn)
+
+    async def _mark_used(self, conn):
+        self._last_used[conn] = time.monotonic()
+
+    @asynccontextmanager
+    async def connection(self):
+        """async with pool.connection() as conn: ... (예외가 나도 연결은 풀로 반환)"""
+        started = time.perf_counter()
+        try:
+            conn = await self._pool.getconn()
+        except psycopg_pool.PoolTimeout:
+            self._timeouts += 1
+            raise PoolTimeout(f"DB 연결 대기 시간 초과 ({self.acquire_timeout}초, 최대 {self.max_size}개 사용 중)")
+        self._acquired += 1
+        self._waits.append(time.perf_counter() - started)
+
+        try:
+            yield conn
+        finally:
+            await self._pool.putconn(conn)
+
+    def stats(self):
+        pool_stats = self._pool.get_stats()
+        result = {
+            'max_size': self.max_size,
+            'in_use': pool_stats['pool_size'] - pool_stats['pool_available'],
+            'acquired': self._acquired,
+            'timeouts': self._timeouts,
+            'replaced': pool_stats.get('connections_lost', 0) + pool_stats.get('returns_bad', 0),
+        }
+        result.update(_wait_stats(self._waits))
+        return result
+
+    async def close(self):
+        await self._pool.close()
+
+
+def _wait_stats(waits):
+    waits = sorted(waits)
+    if not waits:
+        return {}
+    return {
+        'wait_mean_ms': sum(waits) / len(waits) * 1000,
+        'wait_p95_ms': waits[min(len(waits) - 1, int(len(waits) * 0.95))] * 1000,
+        'wait_max_ms': waits[-1] * 1000,
+    }
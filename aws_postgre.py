@@ -1,7 +1,97 @@
 import psycopg2
-from datetime import datetime
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from contextlib import contextmanager
+from datetime import date, timedelta
 import pandas as pd
-import requests
+import argparse
+import io
+import signal
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from aws_archive import RawArchive
+from aws_cache import notify_changed
+from aws_client import DEFAULT_SITE_ID, DEFAULT_DEV_ID, SiteRateLimiter, StationClient, get_client
+from aws_parser import WEATHER_COLUMNS, parse_payload
+from aws_quality import STUCK_RUN, add_quality_flags
+from aws_query import local_now, local_today
+from aws_rain import add_rain_increment
+from aws_rollup import refresh_rollups
+from aws_stations import DEFAULT_STATIONS_PATH, load_stations
+
+# 임시 테이블로 COPY하는 컬럼 (파싱 결과 + 적재 시 계산하는 컬럼)
+STAGED_COLUMNS = WEATHER_COLUMNS + ['qc_flags', 'rain_increment']
+
+# 대량 적재용 임시 테이블 (트랜잭션 종료 시 자동 삭제)
+STAGING_DDL = """
+    CREATE TEMP TABLE weather_staging (
+        timestamp TIMESTAMP,
+        temp DOUBLE PRECISION,
+        humid DOUBLE PRECISION,
+        radn DOUBLE PRECISION,
+        wind_degree DOUBLE PRECISION,
+        wind DOUBLE PRECISION,
+        rainfall DOUBLE PRECISION,
+        battery DOUBLE PRECISION,
+        qc_flags SMALLINT,
+        rain_increment DOUBLE PRECISION
+    ) ON COMMIT DROP
+"""
+
+# 임시 테이블 -> weather_data 병합
+# existing은 병합 전 스냅샷 기준이므로 여기에 있던 행은 갱신, 없던 행은 신규
+# (파티션 테이블에서는 RETURNING으로 xmax를 읽을 수 없어 이 방식으로 구분)
+MERGE_SQL = """
+    WITH source AS (
+        SELECT DISTINCT ON (timestamp)
+            timestamp, temp, humid, radn, wind_degree, wind, rainfall, battery, qc_flags, rain_increment
+        FROM weather_staging
+        WHERE timestamp IS NOT NULL
+        ORDER BY timestamp
+    ),
+    existing AS (
+        SELECT w.timestamp
+        FROM weather_data w
+        JOIN source s ON w.timestamp = s.timestamp
+        WHERE w.site_id = %(site)s AND w.dev_id = %(dev)s
+    ),
+    merged AS (
+        INSERT INTO weather_data
+        (site_id, dev_id, timestamp, temp, humid, radn, wind_degree, wind, rainfall, battery,
+         qc_flags, rain_increment)
+        SELECT %(site)s, %(dev)s, timestamp, temp, humid, radn, wind_degree, wind, rainfall, battery,
+               qc_flags, rain_increment
+        FROM source
+        ON CONFLICT (site_id, dev_id, timestamp) DO UPDATE SET
+            temp = EXCLUDED.temp,
+            humid = EXCLUDED.humid,
+            radn = EXCLUDED.radn,
+            wind_degree = EXCLUDED.wind_degree,
+            wind = EXCLUDED.wind,
+            rainfall = EXCLUDED.rainfall,
+            battery = EXCLUDED.battery,
+            qc_flags = EXCLUDED.qc_flags,
+            rain_increment = EXCLUDED.rain_increment
+        WHERE (weather_data.temp, weather_data.humid, weather_data.radn, weather_data.wind_degree,
+               weather_data.wind, weather_data.rainfall, weather_data.battery, weather_data.qc_flags,
+               weather_data.rain_increment)
+            IS DISTINCT FROM
+              (EXCLUDED.temp, EXCLUDED.humid, EXCLUDED.radn, EXCLUDED.wind_degree,
+               EXCLUDED.wind, EXCLUDED.rainfall, EXCLUDED.battery, EXCLUDED.qc_flags,
+               EXCLUDED.rain_increment)
+        RETURNING timestamp
+    )
+    SELECT
+        COUNT(*) FILTER (WHERE e.timestamp IS NULL),
+        COUNT(*) FILTER (WHERE e.timestamp IS NOT NULL)
+    FROM merged m
+    LEFT JOIN existing e ON e.timestamp = m.timestamp
+"""
+
+
+# weather_data가 월별 파티션 테이블일 때 미리 만들어 둘 미래 파티션 개월 수
+PARTITION_MONTHS_AHEAD = 3
 
 
 def get_db_connection():
@@ -13,62 +103,305 @@ def get_db_connection():
     )
 
 
-def get_aws(year, month, day):
-    api_url = f"http://203.239.47.148:8080/dspnet.aspx?Site=85&Dev=1&Year={year}&Mon={month}&Day={day}"
-    response = requests.get(api_url)
-    data = response.text.strip().split('\n')
-    df = pd.DataFrame([line.split(',') for line in data])
+def ensure_partitions(conn, first_day, last_day, table='weather_data'):
+    """
+    [first_day, last_day] 구간을 덮는 월별 파티션 생성 (커밋은 호출한 쪽에서)
+    weather_data가 파티션 테이블이 아니거나 aws_schema가 아직 적용되지 않았으면 아무것도 하지 않음
+    """
+    cur = conn.cursor()
+    cur.execute("SELECT to_regproc('weather_data_create_partitions') IS NOT NULL")
+    if not cur.fetchone()[0]:
+        cur.close()
+        return 0
+
+    cur.execute("SELECT weather_data_create_partitions(%s, %s, %s)", (table, first_day, last_day))
+    created = cur.fetchone()[0]
+    cur.close()
+    if created:
+        print(f"🧩 {table} 월별 파티션 {created}개 생성 ({first_day} ~ {last_day})")
+    return created
+
+
+@contextmanager
+def read_cursor(conn):
+    """
+    조회 전용 커서. 이 조회가 시작한 트랜잭션이면 끝날 때 롤백
+    (데몬이 유지하는 연결이 새 데이터가 없는 동안 idle in transaction으로 남지 않도록)
+    """
+    started = conn.get_transaction_status() == TRANSACTION_STATUS_IDLE
+    cur = conn.cursor()
+    try:
+        yield cur
+    finally:
+        cur.close()
+        if started:
+            conn.rollback()
+
 
-    df_clean = pd.DataFrame({
-        'timestamp': pd.to_datetime(df.iloc[:, 0]),
-        'temp': pd.to_numeric(df.iloc[:, 1], errors='coerce'),
-        'humid': pd.to_numeric(df.iloc[:, 2], errors='coerce'),
-        'radn': pd.to_numeric(df.iloc[:, 6], errors='coerce'),
-        'wind_degree': pd.to_numeric(df.iloc[:, 7], errors='coerce'),
-        'wind': pd.to_numeric(df.iloc[:, 13], errors='coerce'),
-        'rainfall': pd.to_numeric(df.iloc[:, 14], errors='coerce'),
-        'battery': pd.to_numeric(df.iloc[:, 16], errors='coerce')
-    })
+def get_last_timestamp(conn=None, site=DEFAULT_SITE_ID, dev=DEFAULT_DEV_ID):
+    """weather_data에 저장된 해당 기상대의 가장 최근 timestamp (없으면 None)"""
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
+    with read_cursor(conn) as cur:
+        cur.execute("""
+            SELECT MAX(timestamp) FROM weather_data
+            WHERE site_id = %s AND dev_id = %s
+        """, (site, dev))
+        last = cur.fetchone()[0]
+    if own_conn:
+        conn.close()
+    return last
 
-    return df_clean
+
+def get_recent_rows(conn, site=DEFAULT_SITE_ID, dev=DEFAULT_DEV_ID, until=None, limit=STUCK_RUN):
+    """until 시각까지 저장된 마지막 limit개 행 (시간 오름차순, 품질 검사 문맥용)"""
+    with read_cursor(conn) as cur:
+        cur.execute(f"""
+            SELECT {', '.join(WEATHER_COLUMNS)} FROM weather_data
+            WHERE site_id = %s AND dev_id = %s AND timestamp <= %s
+            ORDER BY timestamp DESC
+            LIMIT %s
+        """, (site, dev, until, limit))
+        rows = cur.fetchall()
+
+    frame = pd.DataFrame(rows[::-1], columns=WEATHER_COLUMNS)
+    frame['timestamp'] = pd.to_datetime(frame['timestamp'])
+    for col in WEATHER_COLUMNS[1:]:
+        frame[col] = pd.to_numeric(frame[col], errors='coerce')
+    return frame
+
+
+def get_aws(year, month, day, after=None, client=None, site=DEFAULT_SITE_ID, dev=DEFAULT_DEV_ID, archive=None):
+    client = client or get_client()
+    text = client.fetch_day(year, month, day, site=site, dev=dev)
+
+    # 파싱 로직이 바뀌어도 다시 받지 않고 재적재할 수 있도록 원본 응답 보관
+    if archive is not None:
+        archive.save(text, site, dev, date(int(year), int(month), int(day)))
+
+    return parse_payload(text, after=after)
 
 
 def save_to_db(data):
-    conn = get_db_connection()
+    """기존 호출부 호환용: 기본 기상대/장비로 bulk_save_to_db (품질 플래그/강우 증가량도 함께 계산)"""
+    return bulk_save_to_db(data)
+
+
+def bulk_save_to_db(data, conn=None, site=DEFAULT_SITE_ID, dev=DEFAULT_DEV_ID):
+    """
+    COPY로 임시 테이블에 한 번에 적재한 뒤 weather_data에 병합
+    값이 바뀐 행만 갱신하며 신규/갱신/건너뜀 개수를 반환
+    품질 플래그/강우 증가량이 없으면 data만으로 계산
+    """
+    if 'qc_flags' not in data.columns:
+        data = add_quality_flags(data)
+    if 'rain_increment' not in data.columns:
+        data = add_rain_increment(data)
+
+    own_conn = conn is None
+    if own_conn:
+        conn = get_db_connection()
     cur = conn.cursor()
 
-    saved_count = 0
-    for _, row in data.iterrows():
-        try:
-            cur.execute("""
-                INSERT INTO weather_data 
-                (timestamp, temp, humid, radn, wind_degree, wind, rainfall, battery)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (timestamp) DO NOTHING
-            """, (row['timestamp'], row['temp'], row['humid'], row['radn'],
-                  row['wind_degree'], row['wind'], row['rainfall'], row['battery']))
-            saved_count += cur.rowcount
-        except Exception as e:
-            print(f"에러 발생: {e}")
+    try:
+        # 과거 자료 적재 등으로 아직 없는 월 파티션이 필요한 경우 같은 트랜잭션에서 생성
+        stamps = data['timestamp'].dropna()
+        if not stamps.empty:
+            ensure_partitions(conn, stamps.min().date(), stamps.max().date())
+
+        cur.execute(STAGING_DDL)
+
+        buffer = io.StringIO()
+        data[STAGED_COLUMNS].to_csv(buffer, index=False, header=False, date_format='%Y-%m-%d %H:%M:%S')
+        buffer.seek(0)
+        cur.copy_expert(
+            f"COPY weather_staging ({', '.join(STAGED_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+
+        cur.execute(MERGE_SQL, {'site': site, 'dev': dev})
+        inserted, updated = cur.fetchone()
+
+        # 바뀐 행이 있으면 해당 시간/일 집계도 같은 트랜잭션에서 다시 계산하고 커밋 시 API 캐시에 변경 알림
+        if inserted or updated:
+            first, last = stamps.min().to_pydatetime(), stamps.max().to_pydatetime()
+            refresh_rollups(cur, first, last, site=site, dev=dev)
+            notify_changed(cur, site, dev, first, last)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+        if own_conn:
+            conn.close()
+
+    result = {
+        'inserted': inserted,
+        'updated': updated,
+        'skipped': len(data) - inserted - updated,
+    }
+    print(f"✅ [{site}-{dev}] 신규 {result['inserted']}개 / 갱신 {result['updated']}개 / 건너뜀 {result['skipped']}개")
+    return result
+
+
+def ingest(conn, after=None, client=None, now=None, site=DEFAULT_SITE_ID, dev=DEFAULT_DEV_ID, archive=None):
+    """
+    after 이후의 새 데이터를 수집해 저장하고 갱신된 high-water mark 반환
+    마지막 저장 날짜부터 오늘까지 하루씩 확인 (중단 기간이 하루를 넘어도 사이 날짜를 건너뛰지 않음)
+    """
+    now = now or local_now()
+    first = after.date() if after is not None and after.date() < now.date() else now.date()
+    days = [first + timedelta(days=i) for i in range((now.date() - first).days + 1)]
+
+    for day in days:
+        print(f"📡 [{site}-{dev}] {day} 기상 데이터 수집 중...")
+        data = get_aws(day.year, f"{day.month:02d}", f"{day.day:02d}", after=after, client=client,
+                       site=site, dev=dev, archive=archive)
+        if data.empty:
+            print(f"💤 [{site}-{dev}] 새 데이터 없음 (마지막 저장: {after})")
             continue
 
-    conn.commit()
-    cur.close()
-    conn.close()
-    print(f"✅ {saved_count}개 새 데이터 저장 완료")
+        print(f"📥 [{site}-{dev}] {len(data)}개 데이터 수신")
+        context = get_recent_rows(conn, site, dev, after) if after is not None else None
+        data = add_quality_flags(data, context)
+        data = add_rain_increment(data, context)
+        bulk_save_to_db(data, conn, site=site, dev=dev)
+        latest = data['timestamp'].max().to_pydatetime()
+        after = latest if after is None else max(after, latest)
+
+    return after
+
+
+class IngestScheduler:
+    """
+    등록된 기상대들을 작업 스레드 풀에 나눠 수집
+    작업 스레드마다 DB 연결 하나를 유지하고, 기상대별 high-water mark는 메모리에 보관
+    같은 기상대(site)로 가는 요청은 기상대 목록의 min_interval 간격으로 제한
+    """
+
+    def __init__(self, stations, workers=4, full=False, archive=None):
+        self.stations = stations
+        self.archive = archive
+        self.client = StationClient(
+            pool_size=max(workers, 1),
+            rate_limiter=SiteRateLimiter({s.site: s.min_interval for s in stations}),
+        )
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        # full이면 첫 수집만 하루치 전체, 이후에는 증분
+        self.after = {(s.site, s.dev): None for s in stations} if full else {}
+
+        self._local = threading.local()
+        self._conns = []
+        self._lock = threading.Lock()
+        self._partitions_checked = None
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or conn.closed:
+            conn = get_db_connection()
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def _ingest_station(self, station):
+        key = (station.site, station.dev)
+        conn = self._conn()
+        try:
+            if key not in self.after:
+                self.after[key] = get_last_timestamp(conn, station.site, station.dev)
+            self.after[key] = ingest(conn, self.after[key], client=self.client,
+                                     site=station.site, dev=station.dev, archive=self.archive)
+        except psycopg2.Error:
+            # 다음 주기에 새 연결로 마지막 저장 시각부터 다시 수집
+            conn.close()
+            self.after.pop(key, None)
+            raise
+
+    def _ensure_partitions(self):
+        """하루에 한 번 앞으로 쓸 월별 파티션을 미리 생성"""
+        today = local_today()
+        if self._partitions_checked == today:
+            return
+        conn = self._conn()
+        try:
+            ensure_partitions(conn, today, today + timedelta(days=31 * PARTITION_MONTHS_AHEAD))
+            conn.commit()
+        except psycopg2.Error:
+            # 실패한 트랜잭션에 묶이지 않도록 닫고, 다음 주기에 새 연결로 다시 시도
+            conn.close()
+            raise
+        self._partitions_checked = today
+
+    def run_once(self):
+        """모든 기상대를 한 번씩 수집하고 실패한 기상대 목록 반환"""
+        try:
+            self._ensure_partitions()
+        except psycopg2.Error as e:
+            print(f"❌ 파티션 생성 실패: {e}")
+
+        futures = {self.executor.submit(self._ingest_station, s): s for s in self.stations}
+        failed = []
+        for future in as_completed(futures):
+            station = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                print(f"❌ [{station.name}] 수집 실패: {e}")
+                failed.append(station)
+        return failed
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        with self._lock:
+            while self._conns:
+                self._conns.pop().close()
+        self.client.close()
+
+
+def run_daemon(scheduler, interval):
+    """
+    프로세스, DB 연결, HTTP 세션을 유지한 채 interval초마다 수집
+    실행 시각은 벽시계 기준 interval 배수에 맞추고, SIGTERM/SIGINT 수신 시 현재 작업을 마친 뒤 종료
+    """
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda signum, frame: stop.set())
+
+    print(f"🚀 수집 데몬 시작 (기상대 {len(scheduler.stations)}곳, {interval}초 간격)")
+
+    while not stop.is_set():
+        scheduler.run_once()
+
+        now = time.time()
+        stop.wait((now // interval + 1) * interval - now)
+
+    print(f"👋 수집 데몬 종료 (기상대 요청 통계: {scheduler.client.stats()})")
 
 
-    def main():
-        current_date = datetime.now()
-        year = current_date.year
-        month = str(current_date.month).zfill(2)
-        day = str(current_date.day).zfill(2)
+def main():
+    parser = argparse.ArgumentParser(description='AWS 기상 데이터 수집')
+    parser.add_argument('--full', action='store_true', help='저장된 마지막 시각과 무관하게 하루치 전체 수집')
+    parser.add_argument('--daemon', action='store_true', help='종료하지 않고 주기적으로 계속 수집')
+    parser.add_argument('--interval', type=float, default=30, help='데몬 수집 간격 (초)')
+    parser.add_argument('--stations', default=DEFAULT_STATIONS_PATH, help='기상대 목록 파일 (JSON)')
+    parser.add_argument('--workers', type=int, default=4, help='동시에 수집할 기상대 수')
+    parser.add_argument('--archive', help='원본 응답을 gzip으로 보관할 경로 (미지정 시 보관 안 함)')
+    args = parser.parse_args()
 
-    print(f"📡 {year}-{month}-{day} 기상 데이터 수집 중...")
-    data = get_aws(year, month, day)
-    print(f"📥 {len(data)}개 데이터 수신")
-    save_to_db(data)
+    archive = RawArchive(args.archive) if args.archive else None
+    scheduler = IngestScheduler(load_stations(args.stations), workers=args.workers, full=args.full,
+                                archive=archive)
+    try:
+        if args.daemon:
+            run_daemon(scheduler, args.interval)
+        else:
+            scheduler.run_once()
+    finally:
+        scheduler.close()
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+
+# 품질 플래그 (비트마스크, weather_data.qc_flags)
+FLAG_STUCK = 1          # 같은 값이 오래 이어짐 (센서 멈춤)
+FLAG_OUT_OF_RANGE = 2   # 물리적으로 불가능한 값
+FLAG_SPIKE = 4          # 직전 값 대비 급변
+FLAG_GAP = 8            # 직전 행과의 시간 간격이 비어 있음
+FLAG_LOW_BATTERY = 16   # 배터리 전압 낮음
+
+FLAG_NAMES = {
+    FLAG_STUCK: 'stuck',
+    FLAG_OUT_OF_RANGE: 'out_of_range',
+    FLAG_SPIKE: 'spike',
+    FLAG_GAP: 'gap',
+    FLAG_LOW_BATTERY: 'low_battery',
+}
+
+# 허용 범위 (min, max)
+VALID_RANGES = {
+    'temp': (-40.0, 60.0),
+    'humid': (0.0, 100.0),
+    'radn': (0.0, 1500.0),
+    'wind_degree': (0.0, 360.0),
+    'wind': (0.0, 60.0),
+    'rainfall': (0.0, 1000.0),
+    'battery': (0.0, 20.0),
+}
+
+# 1분당 최대 변화량
+SPIKE_LIMITS = {
+    'temp': 3.0,
+    'humid': 15.0,
+}
+
+# 이 행 수(분) 이상 값이 변하지 않으면 멈춘 것으로 판단
+STUCK_COLUMNS = ['temp', 'humid']
+STUCK_RUN = 120
+
+# 비/안개 중에는 습도가 몇 시간씩 포화(100%)로 유지되므로 이 값 이상은 멈춤 판단에서 제외
+SATURATED_HUMID = 99.0
+
+# 분 단위 자료이므로 90초 이상 비면 누락
+GAP_SECONDS = 90
+
+LOW_BATTERY_VOLTS = 11.5
+
+
+def _run_lengths(values):
+    """각 원소가 속한 '같은 값 연속 구간'의 길이 (NaN은 매번 새 구간)"""
+    if len(values) == 0:
+        return np.zeros(0, dtype=np.int64)
+    changed = np.ones(len(values), dtype=bool)
+    changed[1:] = ~(values[1:] == values[:-1])
+    run_id = np.cumsum(changed) - 1
+    return np.bincount(run_id)[run_id]
+
+
+def compute_flags(data, context=None):
+    """
+    행별 품질 플래그 비트마스크 계산 (NumPy 배열 연산 한 번씩, 행 단위 반복 없음)
+    context: data 바로 앞의 이미 저장된 행들 (증분 수집 시 첫 행의 급변/누락/멈춤 판단용)
+    """
+    n = len(data)
+    if context is not None and not context.empty:
+        frame = pd.concat([context, data], ignore_index=True)
+    else:
+        frame = data
+    offset = len(frame) - n
+
+    flags = np.zeros(len(frame), dtype=np.int16)
+
+    for col, (low, high) in VALID_RANGES.items():
+        values = frame[col].to_numpy(dtype='float64')
+        flags[(values < low) | (values > high)] |= FLAG_OUT_OF_RANGE
+
+    stamps = frame['timestamp'].to_numpy(dtype='datetime64[s]').astype('int64')
+    dt = np.diff(stamps, prepend=stamps[:1])
+    flags[dt > GAP_SECONDS] |= FLAG_GAP
+
+    minutes = np.maximum(dt, 60) / 60.0
+    for col, limit in SPIKE_LIMITS.items():
+        values = frame[col].to_numpy(dtype='float64')
+        delta = np.abs(np.diff(values, prepend=values[:1])) / minutes
+        flags[delta > limit] |= FLAG_SPIKE
+
+    for col in STUCK_COLUMNS:
+        values = frame[col].to_numpy(dtype='float64')
+        if col == 'humid':
+            # 포화 구간은 NaN으로 바꿔 매 행 새 구간으로 (연속 길이에 포함되지 않음)
+            values = np.where(values >= SATURATED_HUMID, np.nan, values)
+        flags[_run_lengths(values) >= STUCK_RUN] |= FLAG_STUCK
+
+    battery = frame['battery'].to_numpy(dtype='float64')
+    flags[battery < LOW_BATTERY_VOLTS] |= FLAG_LOW_BATTERY
+
+    return flags[offset:]
+
+
+def add_quality_flags(data, context=None):
+    """data에 qc_flags 컬럼을 붙인 복사본"""
+    data = data.copy()
+    data['qc_flags'] = compute_flags(data, context)
+    return data
+
+
+def describe_flags(mask):
+    """비트마스크 -> 플래그 이름 목록"""
+    return [name for flag, name in FLAG_NAMES.items() if mask & flag]
@@ -0,0 +1,112 @@
+import base64
+import json
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+
+# weather_data.timestamp는 time zone 없이 기상대 현지 시각(KST)으로 저장됨
+# 날짜 조건은 DB 세션의 TimeZone/CURRENT_DATE가 아니라 이 기준으로 계산
+STATION_TZ = ZoneInfo('Asia/Seoul')
+
+
+def parse_date(value):
+    """'YYYY-MM-DD' -> date (형식이 틀리면 ValueError)"""
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def to_local(value):
+    """time zone이 있는 datetime은 기상대 현지 시각으로 바꾼 뒤 tzinfo 제거 (weather_data.timestamp와 비교용)"""
+    if value.tzinfo is not None:
+        value = value.astimezone(STATION_TZ).replace(tzinfo=None)
+    return value
+
+
+def local_now():
+    return datetime.now(STATION_TZ).replace(tzinfo=None)
+
+
+def local_today():
+    return local_now().date()
+
+
+def day_bounds(start, end=None):
+    """
+    날짜(포함) 구간 -> 반열림 시각 구간 [start 00:00, end 다음날 00:00)
+    end 미지정 시 start 하루
+    """
+    start = parse_date(start)
+    end = parse_date(end) if end is not None else start
+    first = datetime.combine(start, datetime.min.time())
+    last = datetime.combine(end + timedelta(days=1), datetime.min.time())
+    return first, last
+
+
+def time_filter(start=None, end=None, column='timestamp'):
+    """
+    시각 구간 조건 ({column} >= start AND {column} < end)
+    컬럼을 함수로 감싸지 않으므로 timestamp 인덱스와 파티션 제외를 그대로 사용
+    """
+    sql, params = "", ()
+    if start is not None:
+        sql += f" AND {column} >= %s"
+        params += (to_local(start),)
+    if end is not None:
+        sql += f" AND {column} < %s"
+        params += (to_local(end),)
+    return sql, params
+
+
+def row_filter(site=None, exclude_flags=None):
+    """
+    공통 행 조건: 기상대, 품질 플래그
+    exclude_flags에 해당하는 플래그가 하나라도 있는 행 제외
+    """
+    sql, params = "", ()
+    if site is not None:
+        sql += " AND site_id = %s"
+        params += (site,)
+    if exclude_flags:
+        sql += " AND (qc_flags & %s) = 0"
+        params += (exclude_flags,)
+    return sql, params
+
+
+def where_clause(start=None, end=None, site=None, exclude_flags=None):
+    """시각 구간 + 공통 행 조건을 합친 WHERE 절과 파라미터"""
+    time_sql, time_params = time_filter(start, end)
+    row_sql, row_params = row_filter(site, exclude_flags)
+    return f"WHERE TRUE{time_sql}{row_sql}", time_params + row_params
+
+
+class InvalidCursor(ValueError):
+    """페이지 cursor 토큰을 해석할 수 없음"""
+
+
+def encode_cursor(row):
+    """행의 (timestamp, site_id, dev_id) 위치 -> 다음 페이지용 불투명 토큰"""
+    key = [row['timestamp'].isoformat(), row['site_id'], row['dev_id']]
+    return base64.urlsafe_b64encode(json.dumps(key, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """encode_cursor 토큰 -> (timestamp, site_id, dev_id)"""
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        stamp, site, dev = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(stamp), int(site), int(dev)
+    except (ValueError, TypeError):
+        raise InvalidCursor("cursor 값이 올바르지 않습니다")
+
+
+def keyset_filter(cursor):
+    """
+    (timestamp, site_id, dev_id) 내림차순 정렬에서 cursor 다음 행부터 (페이지 깊이와 무관하게 인덱스에서 바로 시작)
+    timestamp <= 조건은 timestamp 인덱스 범위 조건으로, 행 비교는 같은 시각의 기상대 간 순서로 사용
+    """
+    if cursor is None:
+        return "", ()
+    stamp, site, dev = cursor
+    return (" AND timestamp <= %s AND (timestamp, site_id, dev_id) < (%s, %s, %s)",
+            (stamp, stamp, site, dev))
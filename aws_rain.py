@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+
+def rain_increments(data, context=None):
+    """
+    기상대 누적 강우(rainfall)를 구간별 강우량으로 변환 (NumPy 배열 연산)
+    - 누적값은 자정에 0으로 초기화되므로 날짜가 바뀐 첫 행은 누적값 자체가 증가량
+    - 누적값이 줄어든 경우(중간 초기화)도 누적값 자체를 증가량으로 봄
+    - 누적값이 비어 있는 행은 직전의 유효한 누적값과 비교하고, 자신의 증가량은 NaN
+    context: data 바로 앞의 이미 저장된 행들 (증분 수집 시 첫 행의 증가량 계산용)
+    """
+    n = len(data)
+    if context is not None and not context.empty:
+        frame = pd.concat([context[['timestamp', 'rainfall']], data[['timestamp', 'rainfall']]], ignore_index=True)
+    else:
+        frame = data
+    offset = len(frame) - n
+
+    values = frame['rainfall'].to_numpy(dtype='float64')
+    previous = pd.Series(values).ffill().shift(1).to_numpy(dtype='float64')
+
+    days = frame['timestamp'].to_numpy(dtype='datetime64[D]')
+    new_day = np.ones(len(days), dtype=bool)
+    new_day[1:] = days[1:] != days[:-1]
+
+    increments = values - previous
+    reset = new_day | np.isnan(previous) | (increments < 0)
+    increments = np.where(reset, values, increments)
+
+    return increments[offset:]
+
+
+def add_rain_increment(data, context=None):
+    """data에 rain_increment 컬럼을 붙인 복사본"""
+    data = data.copy()
+    data['rain_increment'] = rain_increments(data, context)
+    return data
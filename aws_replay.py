@@ -0,0 +1,79 @@
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pandas as pd
+
+from aws_archive import DEFAULT_ARCHIVE_DIR, RawArchive
+from aws_client import DEFAULT_SITE_ID, DEFAULT_DEV_ID
+from aws_parser import parse_payload
+from aws_postgre import get_db_connection, bulk_save_to_db, ensure_partitions
+
+
+def _parse_day(archive, site, dev, day):
+    text = archive.load(site, dev, day)
+    return parse_payload(text) if text is not None else None
+
+
+def replay(archive, site=DEFAULT_SITE_ID, dev=DEFAULT_DEV_ID, start_date=None, end_date=None,
+           workers=4, batch_days=31):
+    """
+    보관된 원본 응답을 네트워크 없이 다시 파싱해 weather_data에 적재
+    파싱은 스레드 풀에서 병렬로, 적재는 batch_days일씩 묶어 COPY 한 번으로 처리
+    """
+    days = archive.days(site, dev, start_date, end_date)
+    print(f"🗄️ [{site}-{dev}] 보관된 {len(days)}일 재적재 시작")
+    if not days:
+        return {'inserted': 0, 'updated': 0, 'skipped': 0}
+
+    totals = {'inserted': 0, 'updated': 0, 'skipped': 0}
+    rows = 0
+    started = time.perf_counter()
+
+    conn = get_db_connection()
+    try:
+        ensure_partitions(conn, days[0], days[-1])
+        conn.commit()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for i in range(0, len(days), batch_days):
+                batch = days[i:i + batch_days]
+                frames = [df for df in executor.map(lambda d: _parse_day(archive, site, dev, d), batch)
+                          if df is not None and not df.empty]
+                if not frames:
+                    continue
+
+                data = pd.concat(frames, ignore_index=True)
+                result = bulk_save_to_db(data, conn, site=site, dev=dev)
+                rows += len(data)
+                for key in totals:
+                    totals[key] += result[key]
+    finally:
+        conn.close()
+
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"🎉 {len(days)}일, {rows}행 재적재 / {elapsed:.1f}초 ({rate:,.0f} rows/s)")
+    print(f"   신규 {totals['inserted']}개 / 갱신 {totals['updated']}개 / 건너뜀 {totals['skipped']}개")
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='보관된 기상대 원본 응답 재적재 (네트워크 사용 안 함)')
+    parser.add_argument('--archive', default=DEFAULT_ARCHIVE_DIR, help='원본 응답 보관 경로')
+    parser.add_argument('--start', help='시작 날짜 (YYYY-MM-DD, 미지정 시 처음부터)')
+    parser.add_argument('--end', help='종료 날짜 (YYYY-MM-DD, 미지정 시 끝까지)')
+    parser.add_argument('--site', type=int, default=DEFAULT_SITE_ID, help='기상대 번호')
+    parser.add_argument('--dev', type=int, default=DEFAULT_DEV_ID, help='장비 번호')
+    parser.add_argument('--workers', type=int, default=4, help='동시 파싱 스레드 수')
+    args = parser.parse_args()
+
+    start_date = datetime.strptime(args.start, "%Y-%m-%d").date() if args.start else None
+    end_date = datetime.strptime(args.end, "%Y-%m-%d").date() if args.end else None
+    replay(RawArchive(args.archive), site=args.site, dev=args.dev,
+           start_date=start_date, end_date=end_date, workers=args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,238 @@
+from datetime import datetime, timedelta
+
+from aws_query import row_filter, time_filter, where_clause
+
+
+# 시간/일 단위 집계 테이블 (적재 트랜잭션 안에서 바뀐 구간만 다시 계산)
+# 평균은 여러 구간을 합칠 수 있도록 합계/개수로 저장
+ROLLUP_SENSORS = ['temp', 'humid', 'radn', 'wind', 'battery']
+
+ROLLUP_TABLES = {
+    'hourly': 'weather_hourly',
+    'daily': 'weather_daily',
+}
+
+_SENSOR_COLUMNS_DDL = ''.join(
+    f"""
+        {col}_sum DOUBLE PRECISION,
+        {col}_count INTEGER NOT NULL DEFAULT 0,
+        {col}_min REAL,
+        {col}_max REAL,"""
+    for col in ROLLUP_SENSORS
+)
+
+ROLLUP_DDL = {
+    table: f"""
+    CREATE TABLE IF NOT EXISTS {table} (
+        site_id INTEGER NOT NULL,
+        dev_id INTEGER NOT NULL,
+        bucket {'TIMESTAMP' if grain == 'hourly' else 'DATE'} NOT NULL,
+        row_count INTEGER NOT NULL,{_SENSOR_COLUMNS_DDL}
+        rain_total DOUBLE PRECISION,
+        PRIMARY KEY (site_id, dev_id, bucket)
+    )
+"""
+    for grain, table in ROLLUP_TABLES.items()
+}
+
+_VALUE_COLUMNS = ['row_count'] + [
+    f"{col}_{part}" for col in ROLLUP_SENSORS for part in ('sum', 'count', 'min', 'max')
+] + ['rain_total']
+
+_UPSERT = f"""
+    ON CONFLICT (site_id, dev_id, bucket) DO UPDATE SET
+        {', '.join(f'{col} = EXCLUDED.{col}' for col in _VALUE_COLUMNS)}
+"""
+
+# weather_data -> weather_hourly
+_HOURLY_SQL = f"""
+    INSERT INTO weather_hourly (site_id, dev_id, bucket, {', '.join(_VALUE_COLUMNS)})
+    SELECT site_id, dev_id, date_trunc('hour', timestamp), COUNT(*),
+           {', '.join(f"SUM({col}), COUNT({col}), MIN({col}), MAX({col})" for col in ROLLUP_SENSORS)},
+           SUM(rain_increment)
+    FROM weather_data
+    {{where_sql}}
+    GROUP BY 1, 2, 3
+    {_UPSERT}
+"""
+
+# weather_hourly -> weather_daily
+_DAILY_SQL = f"""
+    INSERT INTO weather_daily (site_id, dev_id, bucket, {', '.join(_VALUE_COLUMNS)})
+    SELECT site_id, dev_id, bucket::date, SUM(row_count),
+           {', '.join(f"SUM({col}_sum), SUM({col}_count), MIN({col}_min), MAX({col}_max)" for col in ROLLUP_SENSORS)},
+           SUM(rain_total)
+    FROM weather_hourly
+    {{where_sql}}
+    GROUP BY 1, 2, 3
+    {_UPSERT}
+"""
+
+
+def _site_filter(site, dev):
+    sql, params = "", ()
+    if site is not None:
+        sql += " AND site_id = %s"
+        params += (site,)
+    if dev is not None:
+        sql += " AND dev_id = %s"
+        params += (dev,)
+    return sql, params
+
+
+def refresh_rollups(cur, first, last, site=None, dev=None):
+    """
+    first ~ last 시각이 걸친 시간/일 구간을 weather_data에서 다시 집계 (커밋은 호출한 쪽에서)
+    구간 전체를 다시 계산하므로 갱신된 행이 있어도 min/max가 맞고, 여러 번 실행해도 같은 결과
+    """
+    hour_start = first.replace(minute=0, second=0, microsecond=0)
+    hour_end = last.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    day_start = datetime.combine(first.date(), datetime.min.time())
+    day_end = datetime.combine(last.date() + timedelta(days=1), datetime.min.time())
+    site_sql, site_params = _site_filter(site, dev)
+
+    time_sql, time_params = time_filter(hour_start, hour_end)
+    cur.execute(_HOURLY_SQL.format(where_sql=f"WHERE TRUE{time_sql}{site_sql}"), time_params + site_params)
+
+    time_sql, time_params = time_filter(day_start, day_end, column='bucket')
+    cur.execute(_DAILY_SQL.format(where_sql=f"WHERE TRUE{time_sql}{site_sql}"), time_params + site_params)
+
+
+def rollup_grain(start, end):
+    """[start, end) 구간을 그대로 덮는 가장 큰 집계 단위 ('daily', 'hourly', 없으면 None)"""
+    if start is None or end is None:
+        return None
+    if start.time() == end.time() == datetime.min.time():
+        return 'daily'
+    if all(value.minute == value.second == value.microsecond == 0 for value in (start, end)):
+        return 'hourly'
+    return None
+
+
+def _avg(col):
+    return f"SUM({col}_sum) / NULLIF(SUM({col}_count), 0)"
+
+
+def stats_query(start, end, site=None, exclude_flags=None):
+    """
+    /api/weather/stats 쿼리와 파라미터
+    품질 플래그 제외 조건이 없고 구간이 시/일 경계에 맞으면 집계 테이블에서, 아니면 원본에서 계산
+    """
+    grain = None if exclude_flags else rollup_grain(start, end)
+    if grain is None:
+        where_sql, params = where_clause(start, end, site=site, exclude_flags=exclude_flags)
+        return f"""
+            SELECT
+                AVG(temp) as avg_temp,
+                MAX(temp) as max_temp,
+                MIN(temp) as min_temp,
+                AVG(humid) as avg_humid,
+                SUM(rain_increment) as total_rainfall,
+                AVG(radn) as avg_radn,
+                COUNT(*) as data_count
+            FROM weather_data
+            {where_sql}
+        """, params
+
+    time_sql, time_params = time_filter(start, end, column='bucket')
+    site_sql, site_params = row_filter(site)
+    return f"""
+        SELECT
+            {_avg('temp')} as avg_temp,
+            MAX(temp_max) as max_temp,
+            MIN(temp_min) as min_temp,
+            {_avg('humid')} as avg_humid,
+            SUM(rain_total) as total_rainfall,
+            {_avg('radn')} as avg_radn,
+            COALESCE(SUM(row_count), 0) as data_count
+        FROM {ROLLUP_TABLES[grain]}
+        WHERE TRUE{time_sql}{site_sql}
+    """, time_params + site_params
+
+
+def version_query(start, end, site=None, exclude_flags=None):
+    """
+    조회 구간의 데이터 버전 (last: 마지막 timestamp, count: 행 수) 쿼리와 파라미터
+    행 수는 품질 플래그 조건이 없고 구간이 시/일 경계에 맞으면 집계 테이블의 row_count 합으로
+    (긴 구간도 원본 COUNT(*) 없이 일/시간 수에 비례하는 비용, 마지막 시각은 인덱스로 찾음)
+    """
+    where_sql, params = where_clause(start, end, site=site, exclude_flags=exclude_flags)
+    grain = None if exclude_flags else rollup_grain(start, end)
+    if grain is None:
+        return f"""
+            SELECT MAX(timestamp) AS last, COUNT(*) AS count FROM weather_data
+            {where_sql}
+        """, params
+
+    time_sql, time_params = time_filter(start, end, column='bucket')
+    site_sql, site_params = row_filter(site)
+    return f"""
+        SELECT
+            (SELECT MAX(timestamp) FROM weather_data {where_sql}) AS last,
+            (SELECT COALESCE(SUM(row_count), 0) FROM {ROLLUP_TABLES[grain]} WHERE TRUE{time_sql}{site_sql}) AS count
+    """, params + time_params + site_params
+
+
+def series_query(grain, start, end, site=None):
+    """
+    집계 단위별 시계열 쿼리 (기상대를 지정하지 않으면 전체 기상대를 합침)
+    컬럼: bucket, 센서별 평균/최소/최대, rain_total, row_count
+    """
+    time_sql, time_params = time_filter(start, end, column='bucket')
+    site_sql, site_params = row_filter(site)
+    sensors = ',\n            '.join(
+        f"{_avg(col)} AS {col}, MIN({col}_min) AS {col}_min, MAX({col}_max) AS {col}_max"
+        for col in ROLLUP_SENSORS
+    )
+    return f"""
+        SELECT bucket,
+            {sensors},
+            SUM(rain_total) AS rain_total,
+            SUM(row_count) AS row_count
+        FROM {ROLLUP_TABLES[grain]}
+        WHERE TRUE{time_sql}{site_sql}
+        GROUP BY bucket
+        ORDER BY bucket
+    """, time_params + site_params
+
+
+# 버킷 시작 기준 (현지 시각 자정)
+BUCKET_ORIGIN = datetime(2000, 1, 1)
+
+
+def bucket_query(width, start, end=None, site=None, exclude_flags=None):
+    """
+    기상대/장비별 width(timedelta) 간격 버킷의 센서별 평균/최소/최대, rain_total, row_count
+    품질 플래그 조건이 없고 width와 구간이 시/일 경계에 맞으면 집계 테이블에서, 아니면 원본에서 계산
+    """
+    grain = None if exclude_flags else rollup_grain(start, end)
+    if grain == 'daily' and width % timedelta(days=1):
+        grain = 'hourly'
+    if grain == 'hourly' and width % timedelta(hours=1):
+        grain = None
+
+    if grain is None:
+        where_sql, params = where_clause(start, end, site=site, exclude_flags=exclude_flags)
+        source, stamp = 'weather_data', 'timestamp'
+        sensors = [f"AVG({col}) AS {col}, MIN({col}) AS {col}_min, MAX({col}) AS {col}_max"
+                   for col in ROLLUP_SENSORS]
+        totals = "SUM(rain_increment) AS rain_total, COUNT(*) AS row_count"
+    else:
+        time_sql, time_params = time_filter(start, end, column='bucket')
+        site_sql, site_params = row_filter(site)
+        where_sql, params = f"WHERE TRUE{time_sql}{site_sql}", time_params + site_params
+        source, stamp = ROLLUP_TABLES[grain], 'bucket::timestamp'
+        sensors = [f"{_avg(col)} AS {col}, MIN({col}_min) AS {col}_min, MAX({col}_max) AS {col}_max"
+                   for col in ROLLUP_SENSORS]
+        totals = "SUM(rain_total) AS rain_total, SUM(row_count) AS row_count"
+
+    sensors = ',\n            '.join(sensors)
+    return f"""
+        SELECT site_id, dev_id, date_bin(%s, {stamp}, %s) AS bucket,
+            {sensors},
+            {totals}
+        FROM {source}
+        {where_sql}
+        GROUP BY 1, 2, 3
+        ORDER BY 3 DESC, 1 DESC, 2 DESC
+    """, (width, BUCKET_ORIGIN, *params)
@@ -0,0 +1,382 @@
+import argparse
+from datetime import date
+
+from aws_client import DEFAULT_SITE_ID, DEFAULT_DEV_ID
+from aws_postgre import PARTITION_MONTHS_AHEAD, ensure_partitions, get_db_connection
+from aws_query import local_today
+from aws_rollup import ROLLUP_DDL, ROLLUP_TABLES, refresh_rollups
+
+
+WEATHER_DATA_COLUMNS = [
+    'site_id', 'dev_id', 'timestamp', 'temp', 'humid', 'radn', 'wind_degree', 'wind', 'rainfall', 'battery',
+    'qc_flags', 'rain_increment',
+]
+
+# 신규 설치는 처음부터 timestamp 기준 월별 파티션 테이블로 생성
+WEATHER_DATA_DDL = f"""
+    CREATE TABLE IF NOT EXISTS {{table}} (
+        site_id INTEGER NOT NULL DEFAULT {DEFAULT_SITE_ID},
+        dev_id INTEGER NOT NULL DEFAULT {DEFAULT_DEV_ID},
+        timestamp TIMESTAMP NOT NULL,
+        temp REAL,
+        humid REAL,
+        radn REAL,
+        wind_degree REAL,
+        wind REAL,
+        rainfall REAL,
+        battery REAL,
+        qc_flags SMALLINT NOT NULL DEFAULT 0,
+        rain_increment REAL,
+        CONSTRAINT {{table}}_pkey PRIMARY KEY (site_id, dev_id, timestamp)
+    ) PARTITION BY RANGE (timestamp)
+"""
+
+# weather_data 보조 인덱스 (이름 -> 정의). 파티션 테이블에서는 각 파티션에 자동으로 생성됨
+WEATHER_DATA_INDEXES = {
+    # 기상대 조건 없이 시간으로만 조회하는 쿼리 + /range 페이지 순서 (timestamp, site_id, dev_id)
+    'weather_data_time_order_idx': 'USING btree (timestamp, site_id, dev_id)',
+}
+
+# 위 인덱스로 대체됐거나 쓰는 쿼리가 없는 예전 인덱스 (migrate에서 삭제)
+# weather_data_flagged_idx(qc_flags <> 0 부분 인덱스)는 API의 (qc_flags & n) = 0 제외 조건에 쓰이지 않음
+LEGACY_INDEXES = ['weather_data_timestamp_idx', 'weather_data_flagged_idx']
+
+# 선택: 시간순으로만 쌓이는 자료용 BRIN 인덱스 (몇 주~몇 년 단위 긴 구간 조회/집계용, 크기가 B-tree의 수백분의 1)
+# 짧은 구간 조회는 여전히 B-tree가 빠르므로 B-tree와 함께 둠
+WEATHER_DATA_BRIN_INDEXES = {
+    'weather_data_timestamp_brin': 'USING brin (timestamp) WITH (pages_per_range = 32)',
+}
+
+# parent 테이블에 [first_day, last_day] 구간을 덮는 월별 파티션 생성 (이미 있거나 파티션 테이블이 아니면 건너뜀)
+CREATE_PARTITIONS_FUNCTION = """
+    CREATE OR REPLACE FUNCTION weather_data_create_partitions(parent TEXT, first_day DATE, last_day DATE)
+    RETURNS INTEGER AS $$
+    DECLARE
+        month_start DATE;
+        partition_name TEXT;
+        created INTEGER := 0;
+    BEGIN
+        IF NOT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(parent)) THEN
+            RETURN 0;
+        END IF;
+
+        FOR month_start IN
+            SELECT generate_series(date_trunc('month', first_day), date_trunc('month', last_day), INTERVAL '1 month')::date
+        LOOP
+            partition_name := 'weather_data_y' || to_char(month_start, 'YYYY') || 'm' || to_char(month_start, 'MM');
+            IF to_regclass(partition_name) IS NULL THEN
+                EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                               partition_name, parent, month_start, (month_start + INTERVAL '1 month')::date);
+                created := created + 1;
+            END IF;
+        END LOOP;
+
+        RETURN created;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+# 기존 행의 rain_increment 채우기 (aws_rain.rain_increments와 같은 규칙)
+# - 직전 행과 날짜가 다르면(자정 초기화) 누적값 자체가 증가량
+# - 누적값이 빈 행은 건너뛰고 직전의 유효한 누적값과 비교 (COUNT로 유효값 구간을 나눠 구간 첫 값을 이어 씀)
+RAIN_INCREMENT_BACKFILL_SQL = """
+    UPDATE weather_data w
+    SET rain_increment = d.increment
+    FROM (
+        SELECT site_id, dev_id, timestamp,
+               CASE WHEN prev IS NULL OR prev_ts::date <> timestamp::date OR rainfall < prev THEN rainfall
+                    ELSE rainfall - prev END AS increment
+        FROM (
+            SELECT site_id, dev_id, timestamp, rainfall,
+                   LAG(filled) OVER w AS prev,
+                   LAG(timestamp) OVER w AS prev_ts
+            FROM (
+                SELECT site_id, dev_id, timestamp, rainfall,
+                       FIRST_VALUE(rainfall) OVER (PARTITION BY site_id, dev_id, valid_count
+                                                   ORDER BY timestamp) AS filled
+                FROM (
+                    SELECT site_id, dev_id, timestamp, rainfall,
+                           COUNT(rainfall) OVER (PARTITION BY site_id, dev_id ORDER BY timestamp) AS valid_count
+                    FROM weather_data
+                ) counted
+            ) carried
+            WINDOW w AS (PARTITION BY site_id, dev_id ORDER BY timestamp)
+        ) lagged
+    ) d
+    WHERE w.rain_increment IS NULL AND w.rainfall IS NOT NULL
+      AND w.site_id = d.site_id AND w.dev_id = d.dev_id AND w.timestamp = d.timestamp
+"""
+
+BACKFILL_CHECKPOINT_DDL = f"""
+    CREATE TABLE IF NOT EXISTS backfill_checkpoint (
+        site_id INTEGER NOT NULL DEFAULT {DEFAULT_SITE_ID},
+        dev_id INTEGER NOT NULL DEFAULT {DEFAULT_DEV_ID},
+        day DATE NOT NULL,
+        row_count INTEGER NOT NULL,
+        finished_at TIMESTAMP NOT NULL DEFAULT NOW(),
+        PRIMARY KEY (site_id, dev_id, day)
+    )
+"""
+
+
+# 파티션 전환 중 기존 weather_data에 쓰인 행의 키 기록 (복사가 끝난 뒤 잠금 아래에서 다시 맞춤)
+PARTITION_CHANGES_DDL = """
+    CREATE TABLE IF NOT EXISTS weather_data_partition_changes (
+        site_id INTEGER NOT NULL,
+        dev_id INTEGER NOT NULL,
+        timestamp TIMESTAMP NOT NULL,
+        PRIMARY KEY (site_id, dev_id, timestamp)
+    )
+"""
+
+PARTITION_CHANGES_TRIGGER = """
+    CREATE OR REPLACE FUNCTION weather_data_track_partition_changes()
+    RETURNS TRIGGER AS $$
+    BEGIN
+        IF TG_OP <> 'INSERT' THEN
+            INSERT INTO weather_data_partition_changes VALUES (OLD.site_id, OLD.dev_id, OLD.timestamp)
+            ON CONFLICT DO NOTHING;
+        END IF;
+        IF TG_OP <> 'DELETE' THEN
+            INSERT INTO weather_data_partition_changes VALUES (NEW.site_id, NEW.dev_id, NEW.timestamp)
+            ON CONFLICT DO NOTHING;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql;
+
+    CREATE OR REPLACE TRIGGER weather_data_partition_changes
+        AFTER INSERT OR UPDATE OR DELETE ON weather_data
+        FOR EACH ROW EXECUTE FUNCTION weather_data_track_partition_changes()
+"""
+
+
+def _unique_indexes(cur, table):
+    """테이블의 유니크 인덱스 목록: (인덱스 이름, 제약조건 이름 또는 None, 기본키 여부, 컬럼 목록)"""
+    cur.execute("""
+        SELECT i.relname, c.conname, ix.indisprimary,
+               ARRAY(
+                   SELECT a.attname
+                   FROM unnest(ix.indkey) WITH ORDINALITY AS k(attnum, ord)
+                   JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = k.attnum
+                   ORDER BY k.ord
+               )
+        FROM pg_index ix
+        JOIN pg_class i ON i.oid = ix.indexrelid
+        LEFT JOIN pg_constraint c ON c.conindid = ix.indexrelid AND c.conrelid = ix.indrelid
+        WHERE ix.indrelid = %s::regclass AND ix.indisunique
+    """, (table,))
+    return cur.fetchall()
+
+
+def _set_primary_key(cur, table, key_column, columns):
+    """
+    기본키를 columns로 교체
+    key_column 하나만으로 된 기존 유니크 인덱스/제약조건은 새 기본키에 포함되므로 삭제
+    """
+    has_key = False
+    for index_name, constraint_name, is_primary, index_columns in _unique_indexes(cur, table):
+        if list(index_columns) == columns:
+            has_key = has_key or is_primary
+            continue
+        if not is_primary and list(index_columns) != [key_column]:
+            continue
+        if constraint_name:
+            cur.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{constraint_name}"')
+        else:
+            cur.execute(f'DROP INDEX "{index_name}"')
+
+    if not has_key:
+        cur.execute(f"ALTER TABLE {table} ADD PRIMARY KEY ({', '.join(columns)})")
+        print(f"🔑 {table} 기본키 -> ({', '.join(columns)})")
+
+
+def _is_partitioned(cur, table):
+    cur.execute("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))", (table,))
+    return cur.fetchone()[0]
+
+
+def _create_indexes(cur, table, brin=False):
+    """WEATHER_DATA_INDEXES(brin이면 BRIN 인덱스 포함)를 table에 생성 (weather_data가 아니면 이름의 접두어를 table로 바꿈)"""
+    indexes = dict(WEATHER_DATA_INDEXES)
+    if brin:
+        indexes.update(WEATHER_DATA_BRIN_INDEXES)
+    for name, definition in indexes.items():
+        index_name = name.replace('weather_data', table, 1)
+        cur.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} {definition}")
+
+
+def migrate(conn, brin=False):
+    """
+    스키마 생성 및 기존 테이블을 현재 스키마로 변경 (여러 번 실행해도 안전)
+    brin: 시간 BRIN 인덱스도 생성
+    """
+    cur = conn.cursor()
+
+    cur.execute(WEATHER_DATA_DDL.format(table='weather_data'))
+    cur.execute(BACKFILL_CHECKPOINT_DDL)
+
+    # 다중 기상대/장비 지원: 기존 행은 기본 기상대 소속
+    for table in ('weather_data', 'backfill_checkpoint'):
+        cur.execute(f"""
+            ALTER TABLE {table}
+                ADD COLUMN IF NOT EXISTS site_id INTEGER NOT NULL DEFAULT {DEFAULT_SITE_ID},
+                ADD COLUMN IF NOT EXISTS dev_id INTEGER NOT NULL DEFAULT {DEFAULT_DEV_ID}
+        """)
+    _set_primary_key(cur, 'weather_data', 'timestamp', ['site_id', 'dev_id', 'timestamp'])
+    _set_primary_key(cur, 'backfill_checkpoint', 'day', ['site_id', 'dev_id', 'day'])
+
+    # 적재 시 계산한 품질 플래그 (aws_quality 비트마스크)
+    cur.execute("ALTER TABLE weather_data ADD COLUMN IF NOT EXISTS qc_flags SMALLINT NOT NULL DEFAULT 0")
+
+    # 누적 강우 -> 구간 강우량 (적재 시 aws_rain에서 계산, 기존 행은 여기서 한 번 채움)
+    cur.execute("ALTER TABLE weather_data ADD COLUMN IF NOT EXISTS rain_increment REAL")
+    cur.execute(RAIN_INCREMENT_BACKFILL_SQL)
+    if cur.rowcount > 0:
+        print(f"🌧️ 기존 {cur.rowcount}개 행의 강우 증가량 계산")
+
+    _create_indexes(cur, 'weather_data', brin=brin)
+    for name in LEGACY_INDEXES:
+        cur.execute(f"DROP INDEX IF EXISTS {name}")
+
+    # 시간/일 집계 테이블 (새로 만들었으면 기존 자료로 한 번 채움)
+    for ddl in ROLLUP_DDL.values():
+        cur.execute(ddl)
+    cur.execute(f"SELECT NOT EXISTS (SELECT 1 FROM {ROLLUP_TABLES['hourly']})")
+    if cur.fetchone()[0]:
+        rebuild_rollups(cur)
+
+    # 월별 파티션 (파티션 테이블이 아니면 함수만 설치)
+    cur.execute(CREATE_PARTITIONS_FUNCTION)
+    today = local_today()
+    ensure_partitions(conn, today, _add_months(today, PARTITION_MONTHS_AHEAD))
+
+    conn.commit()
+    cur.close()
+
+
+def rebuild_rollups(cur):
+    """weather_data 전체로 시간/일 집계 테이블 다시 계산"""
+    cur.execute("SELECT MIN(timestamp), MAX(timestamp) FROM weather_data")
+    first, last = cur.fetchone()
+    if first is None:
+        return
+    refresh_rollups(cur, first, last)
+    print(f"📊 집계 테이블 재계산 ({first:%Y-%m-%d} ~ {last:%Y-%m-%d})")
+
+
+def _add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def partition_weather_data(conn):
+    """
+    기존 단일 weather_data 테이블을 월별 파티션 테이블로 변환
+    1. 트리거로 이후 weather_data에 쓰이는 행(수집/백필/재적재, 과거 월 포함)의 키를 기록하기 시작
+    2. weather_data_new(파티션 테이블)를 만들고 한 달씩 복사하며 매번 커밋 (수집/조회는 계속 동작)
+    3. 마지막에 짧게 쓰기를 막고 기록된 키의 행만 다시 맞춘 뒤 테이블 이름 교체
+    중단되면 다시 실행해서 이어서 진행 (이미 복사된 행은 건너뜀). 기존 테이블은 weather_data_old로 남김
+    """
+    cur = conn.cursor()
+    if _is_partitioned(cur, 'weather_data'):
+        print("✅ weather_data는 이미 파티션 테이블입니다")
+        cur.close()
+        return
+
+    columns = ', '.join(WEATHER_DATA_COLUMNS)
+
+    # 트리거를 만들 때 진행 중인 쓰기가 끝나기를 기다리므로, 이후의 복사는 그 전 쓰기를 모두 보고 이후 쓰기는 기록됨
+    cur.execute(PARTITION_CHANGES_DDL)
+    cur.execute(PARTITION_CHANGES_TRIGGER)
+    conn.commit()
+
+    cur.execute("SELECT MIN(timestamp), MAX(timestamp) FROM weather_data")
+    first, last = cur.fetchone()
+    today = local_today()
+    first_day = first.date() if first else today
+    last_day = last.date() if last else today
+
+    cur.execute(WEATHER_DATA_DDL.format(table='weather_data_new'))
+    cur.execute(CREATE_PARTITIONS_FUNCTION)
+    ensure_partitions(conn, first_day, _add_months(max(last_day, today), PARTITION_MONTHS_AHEAD),
+                      table='weather_data_new')
+    _create_indexes(cur, 'weather_data_new')
+    conn.commit()
+
+    # 2. 한 달 단위로 복사
+    month_start = first_day.replace(day=1)
+    while month_start <= last_day:
+        month_end = _add_months(month_start, 1)
+        cur.execute(f"""
+            INSERT INTO weather_data_new ({columns})
+            SELECT {columns} FROM weather_data
+            WHERE timestamp >= %s AND timestamp < %s
+            ON CONFLICT (site_id, dev_id, timestamp) DO NOTHING
+        """, (month_start, month_end))
+        conn.commit()
+        print(f"📦 {month_start:%Y-%m} {cur.rowcount}개 행 복사")
+        month_start = month_end
+
+    # 3. 쓰기를 잠시 막고 복사 시작 후 바뀐 행을 다시 맞춘 뒤 교체 (조회는 계속 가능)
+    cur.execute("LOCK TABLE weather_data IN EXCLUSIVE MODE")
+    cur.execute("SELECT MIN(timestamp), MAX(timestamp) FROM weather_data_partition_changes")
+    changed_first, changed_last = cur.fetchone()
+    if changed_first is not None:
+        # 복사 범위보다 과거로 백필된 행이 있으면 그 월 파티션도 필요
+        ensure_partitions(conn, changed_first.date(), changed_last.date(), table='weather_data_new')
+    cur.execute("""
+        DELETE FROM weather_data_new n
+        USING weather_data_partition_changes c
+        WHERE n.site_id = c.site_id AND n.dev_id = c.dev_id AND n.timestamp = c.timestamp
+    """)
+    cur.execute(f"""
+        INSERT INTO weather_data_new ({columns})
+        SELECT {', '.join(f'w.{col}' for col in WEATHER_DATA_COLUMNS)}
+        FROM weather_data w
+        JOIN weather_data_partition_changes c USING (site_id, dev_id, timestamp)
+    """)
+    print(f"🔄 복사 중 바뀐 {cur.rowcount}개 행 동기화")
+    cur.execute("DROP TRIGGER weather_data_partition_changes ON weather_data")
+    cur.execute("DROP FUNCTION weather_data_track_partition_changes()")
+    cur.execute("DROP TABLE weather_data_partition_changes")
+
+    cur.execute("SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = 'weather_data'")
+    for (index_name,) in cur.fetchall():
+        cur.execute(f'ALTER INDEX "{index_name}" RENAME TO "{index_name[:59]}_old"')
+    cur.execute("ALTER TABLE weather_data RENAME TO weather_data_old")
+    cur.execute("ALTER TABLE weather_data_new RENAME TO weather_data")
+    cur.execute("ALTER INDEX weather_data_new_pkey RENAME TO weather_data_pkey")
+    for name in WEATHER_DATA_INDEXES:
+        cur.execute(f"ALTER INDEX {name.replace('weather_data', 'weather_data_new', 1)} RENAME TO {name}")
+    conn.commit()
+    cur.close()
+
+    print("✅ weather_data 파티션 전환 완료 (기존 테이블: weather_data_old, 확인 후 삭제)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='weather_data 스키마 생성/마이그레이션')
+    parser.add_argument('--partition', action='store_true', help='기존 weather_data를 월별 파티션 테이블로 변환')
+    parser.add_argument('--brin', action='store_true', help='timestamp BRIN 인덱스 추가 (긴 구간 조회/집계용)')
+    parser.add_argument('--rebuild-rollups', action='store_true', help='시간/일 집계 테이블을 weather_data 전체로 다시 계산')
+    args = parser.parse_args()
+
+    conn = get_db_connection()
+    try:
+        migrate(conn, brin=args.brin)
+        if args.partition:
+            partition_weather_data(conn)
+            migrate(conn, brin=args.brin)
+        if args.rebuild_rollups:
+            cur = conn.cursor()
+            rebuild_rollups(cur)
+            conn.commit()
+            cur.close()
+    finally:
+        conn.close()
+    print("✅ 스키마 적용 완료")
+
+
+if __name__ == '__main__':
+    main()
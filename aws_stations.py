@@ -0,0 +1,40 @@
+from collections import namedtuple
+import json
+import os
+
+from aws_client import DEFAULT_SITE_ID, DEFAULT_DEV_ID
+
+
+DEFAULT_STATIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'stations.json')
+
+# min_interval: 같은 기상대(site)에 보내는 요청 사이의 최소 간격 (초)
+Station = namedtuple('Station', ['name', 'site', 'dev', 'min_interval'])
+
+
+def load_stations(path=DEFAULT_STATIONS_PATH):
+    """
+    기상대 목록 파일(JSON) 읽기
+    파일이 없으면 기존 단일 기상대만 사용
+    """
+    if not os.path.exists(path):
+        return [Station('default', DEFAULT_SITE_ID, DEFAULT_DEV_ID, 0.0)]
+
+    with open(path, encoding='utf-8') as f:
+        config = json.load(f)
+
+    stations = []
+    for item in config['stations']:
+        if not item.get('enabled', True):
+            continue
+        stations.append(Station(
+            name=item.get('name', f"{item['site']}-{item.get('dev', DEFAULT_DEV_ID)}"),
+            site=int(item['site']),
+            dev=int(item.get('dev', DEFAULT_DEV_ID)),
+            min_interval=float(item.get('min_interval', 0.0)),
+        ))
+
+    keys = [(s.site, s.dev) for s in stations]
+    if len(keys) != len(set(keys)):
+        raise ValueError(f"{path}: 중복된 site/dev 항목이 있습니다")
+
+    return stations
@@ -0,0 +1,170 @@
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+from aws_query import local_now
+
+
+class StreamOverflow(Exception):
+    """
+    구독자가 따라오지 못해 큐가 넘침
+    since: 못 받은 행이 빠지지 않도록 다시 구독할 때 쓸 재개 시각 (이미 받은 행이 일부 다시 올 수 있음)
+    """
+
+    def __init__(self, since):
+        super().__init__(f"구독자 큐가 넘쳤습니다 ({since} 이후부터 다시 구독)")
+        self.since = since
+
+
+# 큐가 넘친 구독자에게 넣는 표시 (대기 중인 rows()를 바로 깨움)
+_OVERFLOW = object()
+
+
+class _Subscription:
+    def __init__(self, queue_size, site=None):
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.site = site
+        self.overflowed = False
+        self.dropped_from = None
+
+    def overflow(self, rows):
+        """못 받은 rows와 큐에 남은 행을 버리고, 그중 가장 이른 시각을 재개 지점으로 남긴 뒤 _OVERFLOW를 넣음"""
+        stamps = [row['timestamp'] for row in rows]
+        while not self.queue.empty():
+            stamps.append(self.queue.get_nowait()['timestamp'])
+        self.overflowed = True
+        self.dropped_from = min(stamps)
+        self.queue.put_nowait(_OVERFLOW)
+
+
+class WeatherBroadcaster:
+    """
+    변경 알림(LISTEN) 하나당 새로 적재된 행을 한 번만 조회해 모든 구독자에게 전달
+    - 조회 비용은 구독자 수와 무관 (구독자가 없으면 조회하지 않음)
+    - 기상대/장비별로 마지막으로 보낸 timestamp 이후 행만 보내므로 같은 행을 두 번 보내지 않음
+      (이미 보낸 시각의 값만 바뀐 갱신이나 그보다 과거 시각의 적재는 보내지 않음)
+    - 아직 보낸 적 없는 기상대는 구독이 시작된 시각에서 live_window 전 이후의 행만 실시간 행으로 봄
+      (과거 날짜 백필/재적재 알림은 조회하지 않고 버림)
+    - 구독자마다 queue_size 행까지 쌓아 두고, 넘치면 그 구독자만 바로 StreamOverflow로 끊음
+    fetch는 (query, params) -> dict 행 목록인 코루틴 함수
+    live_window는 관측 시각과 적재 시각의 차이(수집 주기/지연)보다 크게
+    """
+
+    def __init__(self, fetch, queue_size=1000, live_window=timedelta(minutes=10)):
+        self.queue_size = queue_size
+        self.live_window = live_window
+        self._fetch = fetch
+        self._subscribers = set()
+        self._changes = asyncio.Queue()
+        self._last_sent = {}
+        self._live_since = local_now() - live_window
+
+        self._queries = 0
+        self._published = 0
+        self._overflows = 0
+
+    def notify(self, change):
+        """listen_for_changes의 on_change (payload dict, 재연결 시 None). 보는 사람이 없으면 조회하지 않음"""
+        if self._subscribers:
+            self._changes.put_nowait(change)
+
+    async def run(self):
+        """알림을 순서대로 처리 (취소될 때까지 실행)"""
+        while True:
+            change = await self._changes.get()
+            try:
+                await self._publish_change(change)
+            except Exception as e:
+                print(f"❌ 실시간 전송용 조회 실패: {e}")
+
+    async def _publish_change(self, change):
+        if not self._subscribers:
+            return
+        if change is None:
+            # 재연결: 놓친 알림이 있을 수 있으므로 보낸 적 있는 기상대를 모두 확인
+            targets = [(site, dev, None) for site, dev in self._last_sent]
+        else:
+            site, dev = change['site'], change['dev']
+            last_sent = self._last_sent.get((site, dev))
+            last = datetime.fromisoformat(change['last'])
+            if last < self._live_since or (last_sent is not None and last <= last_sent):
+                return
+            targets = [(site, dev, max(datetime.fromisoformat(change['first']), self._live_since))]
+
+        for site, dev, first in targets:
+            last_sent = self._last_sent.get((site, dev))
+            if last_sent is not None:
+                condition, stamp = "timestamp > %s", last_sent
+            else:
+                condition, stamp = "timestamp >= %s", first
+            self._queries += 1
+            rows = await self._fetch(f"""
+                SELECT * FROM weather_data
+                WHERE site_id = %s AND dev_id = %s AND {condition}
+                ORDER BY timestamp
+            """, (site, dev, stamp))
+            if rows:
+                self._last_sent[site, dev] = rows[-1]['timestamp']
+                self.publish(rows)
+
+    def publish(self, rows):
+        self._published += len(rows)
+        for subscription in list(self._subscribers):
+            if subscription.overflowed:
+                continue
+            matched = [row for row in rows if subscription.site is None or row['site_id'] == subscription.site]
+            queue = subscription.queue
+            if queue.maxsize - queue.qsize() < len(matched):
+                subscription.overflow(matched)
+                self._overflows += 1
+                continue
+            for row in matched:
+                queue.put_nowait(row)
+
+    @contextmanager
+    def _subscribe(self, site):
+        if not self._subscribers:
+            # 아무도 보지 않던 동안의 적재는 실시간 행이 아님 (재개 구간은 load_replay로)
+            self._last_sent.clear()
+            self._live_since = local_now() - self.live_window
+        subscription = _Subscription(self.queue_size, site)
+        self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+
+    async def rows(self, load_replay=None, site=None, keepalive=15.0):
+        """
+        구독 후 load_replay() 행(재개 구간)을 먼저, 이후 새로 적재된 행을 차례로 내보내는 async generator
+        replay 조회 전에 구독하므로 그사이 적재된 행도 빠지지 않고, replay에 있던 행은 다시 보내지 않음
+        keepalive초 동안 새 행이 없으면 None, 큐가 넘치면 (대기 중이어도) 바로 StreamOverflow
+        """
+        with self._subscribe(site) as subscription:
+            replayed = set()
+            if load_replay is not None:
+                for row in await load_replay():
+                    replayed.add((row['timestamp'], row['site_id'], row['dev_id']))
+                    yield row
+
+            while True:
+                try:
+                    row = await asyncio.wait_for(subscription.queue.get(), timeout=keepalive)
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if row is _OVERFLOW:
+                    # 재개는 since 초과 조건이므로 못 받은 첫 행보다 1초 앞에서
+                    raise StreamOverflow(subscription.dropped_from - timedelta(seconds=1))
+                if (row['timestamp'], row['site_id'], row['dev_id']) not in replayed:
+                    yield row
+
+    def stats(self):
+        """구독자 수, 알림 처리용 조회 횟수, 보낸 행 수, 큐가 넘쳐 끊긴 구독자 수"""
+        return {
+            'subscribers': len(self._subscribers),
+            'queue_size': self.queue_size,
+            'queries': self._queries,
+            'published_rows': self._published,
+            'overflows': self._overflows,
+        }
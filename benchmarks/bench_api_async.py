@@ -0,0 +1,183 @@
+"""
+API 동시 요청 벤치마크: 기존 동기 엔드포인트(psycopg2 + 스레드풀) vs aws_api 비동기 엔드포인트(psycopg3 async)
+각 구현을 별도 uvicorn 프로세스로 띄우고 동시 클라이언트 수별 초당 요청 수와 p50/p99 지연 시간을 비교
+사용법: python benchmarks/bench_api_async.py --clients 50 200 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PATHS = [
+    '/api/weather/latest',
+    '/api/weather/stats',
+    '/api/weather/range?start_date=2024-05-01&end_date=2024-05-31&limit=60',
+]
+
+
+def make_sync_app():
+    """aws_api의 비동기 전환 이전 구현과 같은 동기 엔드포인트 (psycopg2 연결 풀 + def 핸들러)"""
+    import threading
+
+    from fastapi import FastAPI, HTTPException
+    from psycopg2.extras import RealDictCursor
+    from psycopg2.pool import ThreadedConnectionPool
+
+    import aws_api
+    from aws_query import day_bounds, local_today, where_clause
+    from aws_rollup import stats_query
+
+    pool = {}
+    # ThreadedConnectionPool은 빈 연결이 없으면 바로 PoolError이므로 이전 구현처럼 세마포어로 대기
+    slots = threading.BoundedSemaphore(aws_api.POOL_MAX_SIZE)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        pool['db'] = ThreadedConnectionPool(
+            aws_api.POOL_MIN_SIZE, aws_api.POOL_MAX_SIZE, cursor_factory=RealDictCursor, **aws_api.DB_CONFIG,
+        )
+        yield
+        pool['db'].closeall()
+
+    app = FastAPI(lifespan=lifespan)
+
+    def query(sql, params, one=False):
+        if not slots.acquire(timeout=aws_api.POOL_ACQUIRE_TIMEOUT):
+            raise HTTPException(status_code=503)
+        conn = pool['db'].getconn()
+        try:
+            conn.autocommit = True
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            result = cur.fetchone() if one else cur.fetchall()
+            cur.close()
+        finally:
+            pool['db'].putconn(conn)
+            slots.release()
+        return result
+
+    @app.get("/api/weather/latest")
+    def latest():
+        where_sql, params = where_clause()
+        result = query(f"SELECT * FROM weather_data {where_sql} ORDER BY timestamp DESC LIMIT 1", params, one=True)
+        if not result:
+            raise HTTPException(status_code=404)
+        return result
+
+    @app.get("/api/weather/stats")
+    def stats():
+        sql, params = stats_query(*day_bounds(local_today()))
+        return query(sql, params, one=True)
+
+    @app.get("/api/weather/range")
+    def range_(start_date: str, end_date: str, limit: int = 1000):
+        where_sql, params = where_clause(*day_bounds(start_date, end_date))
+        return query(f"SELECT * FROM weather_data {where_sql} ORDER BY timestamp DESC LIMIT %s", (*params, limit))
+
+    return app
+
+
+def serve(kind, port):
+    import uvicorn
+
+    if kind == 'sync':
+        app = make_sync_app()
+    else:
+        from aws_api import app
+    uvicorn.run(app, host='127.0.0.1', port=port, log_level='warning')
+
+
+async def wait_ready(base_url, timeout=20):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(PATHS[0])).status_code < 500:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"{base_url} 서버가 응답하지 않습니다")
+
+
+async def load(base_url, clients, duration):
+    """clients개의 클라이언트가 duration초 동안 쉬지 않고 요청"""
+    latencies = []
+    errors = 0
+    limits = httpx.Limits(max_connections=clients, max_keepalive_connections=clients)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        deadline = time.monotonic() + duration
+
+        async def worker(n):
+            nonlocal errors
+            i = n
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(PATHS[i % len(PATHS)])
+                    if response.status_code >= 500:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+                i += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(clients)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        'rps': len(latencies) / elapsed,
+        'p50_ms': statistics.median(latencies) * 1000,
+        'p99_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, nargs='+', default=[50, 200])
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--port', type=int, default=8101)
+    parser.add_argument('--serve', choices=['sync', 'async'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve, args.port)
+        return
+
+    results = {}
+    for kind in ('sync', 'async'):
+        server = subprocess.Popen([sys.executable, os.path.abspath(__file__), '--serve', kind, '--port', str(args.port)],
+                                  cwd=ROOT)
+        base_url = f"http://127.0.0.1:{args.port}"
+        try:
+            asyncio.run(wait_ready(base_url))
+            for clients in args.clients:
+                results[kind, clients] = asyncio.run(load(base_url, clients, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+
+    print(f"📊 {', '.join(PATHS)} 순환 요청, {args.duration:.0f}초씩")
+    for clients in args.clients:
+        print(f"\n👥 동시 클라이언트 {clients}")
+        for kind in ('sync', 'async'):
+            r = results[kind, clients]
+            print(f"  {kind:5}: {r['rps']:8.1f} req/s  p50 {r['p50_ms']:7.1f} ms  p99 {r['p99_ms']:7.1f} ms"
+                  f"  오류 {r['errors']}")
+
+
+if __name__ == '__main__':
+    main()
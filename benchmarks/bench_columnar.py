@@ -0,0 +1,86 @@
+"""
+목록 응답 직렬화 벤치마크: 행 단위 JSON(List[WeatherData]) vs format=columnar vs format=arrow
+DB 없이 분 단위 합성 행으로 직렬화 시간과 응답 크기(gzip 포함)만 비교
+사용법: python benchmarks/bench_columnar.py --days 7 --stations 3
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aws_api import WeatherData  # noqa: E402
+from aws_export import encode_arrow, encode_columnar  # noqa: E402
+
+COLUMNS = [
+    'site_id', 'dev_id', 'timestamp', 'temp', 'humid', 'radn', 'wind_degree', 'wind', 'rainfall', 'battery',
+    'qc_flags', 'rain_increment',
+]
+
+
+def make_rows(days, stations, start=datetime(2024, 1, 1), seed=0):
+    """SELECT * 결과와 같은 튜플 행"""
+    rng = random.Random(seed)
+    rows = []
+    for minute in range(days * 1440):
+        ts = start + timedelta(minutes=minute)
+        for dev in range(1, stations + 1):
+            rows.append((
+                85, dev, ts,
+                round(rng.uniform(-5, 30), 1), round(rng.uniform(20, 100), 1), round(rng.uniform(0, 900), 1),
+                float(rng.randrange(360)), round(rng.uniform(0, 8), 1), 0.5 * (minute % 1440 // 240),
+                round(rng.uniform(12, 13.5), 2), 0, 0.0,
+            ))
+    return rows
+
+
+def row_wise(rows):
+    """FastAPI response_model 경로: dict 행 -> pydantic 검증 -> JSON 호환 객체 -> json.dumps"""
+    adapter = TypeAdapter(List[WeatherData])
+    dicts = [dict(zip(COLUMNS, row)) for row in rows]
+    models = adapter.validate_python(dicts)
+    return json.dumps(adapter.dump_python(models, mode='json'), separators=(',', ':')).encode('utf-8')
+
+
+def timeit(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--stations', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.days, args.stations)
+    print(f"📦 합성 행: {args.days}일 x 기상대 {args.stations}곳 = {len(rows):,}행")
+
+    cases = [
+        ('rows', lambda: row_wise(rows)),
+        ('columnar', lambda: encode_columnar(COLUMNS, rows)),
+        ('arrow', lambda: encode_arrow(COLUMNS, rows)),
+    ]
+    baseline = None
+    for name, func in cases:
+        elapsed, body = timeit(func, args.repeat)
+        baseline = baseline or elapsed
+        print(f"{name:9}: {elapsed * 1000:8.1f} ms ({baseline / elapsed:4.1f}x)  "
+              f"{len(body) / 1e6:6.2f} MB  gzip {len(gzip.compress(body, 6)) / 1e6:6.2f} MB")
+
+
+if __name__ == '__main__':
+    main()
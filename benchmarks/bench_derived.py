@@ -0,0 +1,105 @@
+"""
+파생 지표(VPD, 이슬점, GDD, DLI) 벤치마크
+DB 없이 분 단위 합성 행 1년치로 NumPy 일 단위 계산 vs 행마다 계산하는 순수 Python 루프 시간 비교
+(두 결과가 다르면 종료 코드 1, 참고값 검증은 tests/test_aws_derived.py)
+사용법: python benchmarks/bench_derived.py --days 365 --stations 1
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aws_derived import SW_TO_PPFD, daily_metric_rows, daily_metrics  # noqa: E402
+
+
+def make_rows(days, stations, first_day=19723, seed=0):
+    """derived_query 결과와 같은 (site_id, dev_id, 일 수, temp, humid, radn) 튜플 행 (기상대/장비/시각 순)"""
+    rng = random.Random(seed)
+    rows = []
+    for dev in range(1, stations + 1):
+        for minute in range(days * 1440):
+            hour = minute % 1440 / 60
+            sun = max(0.0, math.sin((hour - 6) / 12 * math.pi))
+            rows.append((
+                85, dev, first_day + minute // 1440,
+                round(10 + 12 * sun + rng.uniform(-2, 2), 1),
+                round(min(100.0, 85 - 40 * sun + rng.uniform(-5, 5)), 1),
+                round(850 * sun * rng.uniform(0.6, 1.0), 1) if rng.random() > 0.01 else None,
+            ))
+    return rows
+
+
+def python_loop(rows, base_temp=10.0, upper_temp=30.0):
+    """행마다 math로 계산해 dict에 누적하는 순수 Python 구현 (비교용)"""
+    days = {}
+    for site, dev, day, temp, humid, radn in rows:
+        acc = days.setdefault((site, dev, day), {'n': 0, 'temp': [], 'vpd': [], 'dew': [], 'radn': []})
+        acc['n'] += 1
+        if radn is not None:
+            acc['radn'].append(radn * SW_TO_PPFD)
+        if temp is None or humid is None:
+            continue
+        es = 0.6108 * math.exp(17.27 * temp / (temp + 237.3))
+        gamma = math.log(max(humid, 0.1) / 100) + 17.27 * temp / (temp + 237.3)
+        acc['temp'].append(temp)
+        acc['vpd'].append(es * (1 - humid / 100))
+        acc['dew'].append(237.3 * gamma / (17.27 - gamma))
+
+    result = []
+    for key, acc in days.items():
+        low, high = min(acc['temp']), max(acc['temp'])
+        gdd = max((min(high, upper_temp) + max(low, base_temp)) / 2 - base_temp, 0)
+        dli = sum(acc['radn']) / len(acc['radn']) * 86400 / 1e6
+        result.append((*key, acc['n'], sum(acc['vpd']) / len(acc['vpd']), max(acc['vpd']),
+                       sum(acc['dew']) / len(acc['dew']), gdd, dli))
+    return result
+
+
+def timeit(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--stations', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.days, args.stations)
+    print(f"📦 합성 행: {args.days}일 x 기상대 {args.stations}곳 = {len(rows):,}행")
+
+    loop_time, expected = timeit(lambda: python_loop(rows), args.repeat)
+    numpy_time, result = timeit(lambda: daily_metric_rows(rows), args.repeat)
+    print(f"python 루프: {loop_time * 1000:8.1f} ms")
+    print(f"numpy      : {numpy_time * 1000:8.1f} ms ({loop_time / numpy_time:4.1f}x)  -> {len(result):,}일")
+
+    # 행 목록 -> 배열 변환을 뺀 계산 시간
+    columns = np.array(rows, dtype=np.float64).T
+    compute_time, _ = timeit(lambda: daily_metrics(*columns), args.repeat)
+    print(f"  계산만   : {compute_time * 1000:8.1f} ms (나머지는 튜플 행 -> 배열 변환과 결과 행 생성)")
+
+    # 두 구현의 일 단위 결과가 같은지 (row_count, vpd_mean, vpd_max, dew_point_mean, gdd, dli)
+    mismatched = sum(
+        any(abs(a - b) > 1e-6 for a, b in zip(loop_row[3:], (row[3], *row[8:13])))
+        for loop_row, row in zip(expected, result)
+    )
+    if mismatched or len(expected) != len(result):
+        print(f"❌ 순수 Python 결과와 다른 날: {mismatched}")
+        sys.exit(1)
+    print("✅ 순수 Python 결과와 일치")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+다운샘플링 벤치마크: 기간 길이별 원본 응답 vs max_points LTTB 응답의 행 수/크기와 LTTB 계산 시간
+DB 없이 분 단위 합성 행으로 계산 (resolution 버킷은 SQL 집계이므로 bench_queries.py 쪽에서 확인)
+사용법: python benchmarks/bench_downsample.py --days 1 30 365 --max-points 1000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aws_downsample import lttb_select  # noqa: E402
+from aws_export import encode_columnar  # noqa: E402
+from bench_columnar import COLUMNS, make_rows  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, nargs='+', default=[1, 30, 365])
+    parser.add_argument('--max-points', type=int, default=1000)
+    args = parser.parse_args()
+
+    for days in args.days:
+        rows = make_rows(days, 1)
+        started = time.perf_counter()
+        stamps = [row[2] for row in rows]
+        selected = lttb_select(stamps, [[row[i] for row in rows] for i in (3, 4, 5)], args.max_points)
+        elapsed = time.perf_counter() - started
+
+        full = len(encode_columnar(COLUMNS, rows))
+        reduced = len(encode_columnar(COLUMNS, [rows[i] for i in selected]))
+        print(f"📅 {days:4}일: {len(rows):8,}행 {full / 1e6:7.2f} MB -> {len(selected):6,}행 {reduced / 1e6:6.2f} MB"
+              f"  LTTB {elapsed * 1000:7.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
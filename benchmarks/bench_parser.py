@@ -0,0 +1,88 @@
+"""
+dspnet.aspx 응답 파서 벤치마크: 기존 get_aws 방식 vs aws_parser.parse_payload
+사용법: python benchmarks/bench_parser.py --days 30
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aws_parser import parse_payload  # noqa: E402
+
+
+def make_payload(days, start=datetime(2024, 1, 1), seed=0):
+    """분 단위 17개 필드 + 행 끝 쉼표 형식의 합성 응답"""
+    rng = random.Random(seed)
+    lines = []
+    for minute in range(days * 1440):
+        ts = start + timedelta(minutes=minute)
+        fields = [
+            ts.strftime('%Y-%m-%d %H:%M:%S'),
+            f"{rng.uniform(-5, 30):.1f}", f"{rng.uniform(20, 100):.1f}",
+            '0', '0', '0',
+            f"{max(0.0, rng.uniform(-300, 900)):.1f}", f"{rng.uniform(0, 360):.0f}",
+            '0', '0', '0', '0', '0',
+            f"{rng.uniform(0, 8):.1f}", f"{(minute % 1440) // 240 * 0.5:.1f}",
+            f"{rng.uniform(0, 12):.1f}", f"{rng.uniform(12, 13.5):.2f}",
+            '',
+        ]
+        lines.append(','.join(fields))
+    return '\r\n'.join(lines) + '\r\n'
+
+
+def legacy_parse(text):
+    """기존 aws_postgre.get_aws의 파싱 부분"""
+    data = text.strip().split('\n')
+    df = pd.DataFrame([line.split(',') for line in data])
+
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(df.iloc[:, 0]),
+        'temp': pd.to_numeric(df.iloc[:, 1], errors='coerce'),
+        'humid': pd.to_numeric(df.iloc[:, 2], errors='coerce'),
+        'radn': pd.to_numeric(df.iloc[:, 6], errors='coerce'),
+        'wind_degree': pd.to_numeric(df.iloc[:, 7], errors='coerce'),
+        'wind': pd.to_numeric(df.iloc[:, 13], errors='coerce'),
+        'rainfall': pd.to_numeric(df.iloc[:, 14], errors='coerce'),
+        'battery': pd.to_numeric(df.iloc[:, 16], errors='coerce')
+    })
+
+
+def timeit(func, text, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--days', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_payload(args.days)
+    rows = args.days * 1440
+    print(f"📦 합성 응답: {args.days}일, {rows}행, {len(text) / 1e6:.1f} MB")
+
+    old = legacy_parse(text)
+    new = parse_payload(text)
+    assert len(old) == len(new)
+    pd.testing.assert_frame_equal(old, new, check_dtype=False)
+
+    legacy = timeit(legacy_parse, text, args.repeat)
+    vectorized = timeit(parse_payload, text, args.repeat)
+    print(f"legacy     : {legacy * 1000:8.1f} ms ({rows / legacy:,.0f} rows/s)")
+    print(f"vectorized : {vectorized * 1000:8.1f} ms ({rows / vectorized:,.0f} rows/s)")
+    print(f"speedup    : {legacy / vectorized:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+시각 조건 벤치마크: DATE(timestamp) 조건 vs aws_query 반열림 구간 조건 (B-tree / BRIN 인덱스)
+여러 해 분량의 분 단위 합성 자료를 별도 스키마(bench)에 만들어 실행 계획과 지연 시간을 비교
+bench 스키마를 지우고 다시 만드므로 운영 DB가 아닌 벤치마크용 DB를 --dsn 또는 AWS_BENCH_DSN으로 직접 지정
+사용법: python benchmarks/bench_queries.py --dsn "dbname=aws_bench user=hyejin" --years 3
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+import psycopg2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aws_query import day_bounds, where_clause  # noqa: E402
+
+START = date(2022, 1, 1)
+
+INDEXES = {
+    'btree': 'CREATE INDEX bench_weather_ts ON bench.weather USING btree (timestamp)',
+    'brin': 'CREATE INDEX bench_weather_ts ON bench.weather USING brin (timestamp) WITH (pages_per_range = 32)',
+}
+
+
+def build_dataset(cur, years):
+    """bench.weather에 기상대 1곳의 분 단위 자료 생성"""
+    cur.execute("DROP SCHEMA IF EXISTS bench CASCADE")
+    cur.execute("CREATE SCHEMA bench")
+    cur.execute("""
+        CREATE TABLE bench.weather (
+            site_id INTEGER NOT NULL,
+            dev_id INTEGER NOT NULL,
+            timestamp TIMESTAMP NOT NULL,
+            temp REAL, humid REAL, radn REAL, rain_increment REAL,
+            qc_flags SMALLINT NOT NULL DEFAULT 0
+        )
+    """)
+    cur.execute("""
+        INSERT INTO bench.weather (site_id, dev_id, timestamp, temp, humid, radn, rain_increment)
+        SELECT 85, 1, ts,
+               15 + 10 * sin(extract(epoch FROM ts) / 86400 * 2 * pi()) + random(),
+               60 + 30 * random(), greatest(0, 900 * sin(extract(epoch FROM ts) / 86400 * pi())),
+               CASE WHEN random() < 0.01 THEN 0.5 ELSE 0 END
+        FROM generate_series(%s::timestamp, %s::timestamp - interval '1 minute', interval '1 minute') ts
+    """, (START, START + timedelta(days=365 * years)))
+    rows = cur.rowcount
+    cur.execute("ANALYZE bench.weather")
+    return rows
+
+
+def cases(years):
+    """(이름, 기존 DATE() 조건 쿼리, 새 반열림 구간 쿼리)"""
+    day = START + timedelta(days=365 * years // 2)
+    week_end = day + timedelta(days=6)
+    month_end = day + timedelta(days=29)
+
+    def new(select, start, end, tail=''):
+        where_sql, params = where_clause(*day_bounds(start, end))
+        return f"{select} FROM bench.weather {where_sql} {tail}", params
+
+    rows = "SELECT *"
+    stats = "SELECT AVG(temp), MAX(temp), MIN(temp), SUM(rain_increment), COUNT(*)"
+    return [
+        ('하루',
+         ("SELECT * FROM bench.weather WHERE DATE(timestamp) = %s ORDER BY timestamp DESC", (day,)),
+         new(rows, day, day, 'ORDER BY timestamp DESC')),
+        ('7일',
+         ("SELECT * FROM bench.weather WHERE DATE(timestamp) BETWEEN %s AND %s ORDER BY timestamp DESC",
+          (day, week_end)),
+         new(rows, day, week_end, 'ORDER BY timestamp DESC')),
+        ('30일 통계',
+         (f"{stats} FROM bench.weather WHERE DATE(timestamp) BETWEEN %s AND %s", (day, month_end)),
+         new(stats, day, month_end)),
+    ]
+
+
+def plan_summary(cur, query, params):
+    """EXPLAIN 결과에서 스캔 노드만 추림"""
+    cur.execute("EXPLAIN " + query, params)
+    lines = [row[0].strip().lstrip('-> ') for row in cur.fetchall()]
+    scans = [line.split('  (')[0] for line in lines if 'Scan' in line]
+    return ' / '.join(scans) or lines[0]
+
+
+def latency(cur, query, params, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        cur.execute(query, params)
+        cur.fetchall()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--dsn', default=os.environ.get('AWS_BENCH_DSN'),
+                        help='벤치마크용 DB 접속 문자열 (기본: 환경 변수 AWS_BENCH_DSN)')
+    parser.add_argument('--years', type=int, default=3)
+    parser.add_argument('--repeat', type=int, default=10)
+    parser.add_argument('--keep', action='store_true', help='끝난 뒤 bench 스키마를 남김')
+    args = parser.parse_args()
+    if not args.dsn:
+        parser.error("벤치마크용 DB를 --dsn 또는 AWS_BENCH_DSN으로 지정하세요 (bench 스키마를 지우고 다시 만듭니다)")
+
+    conn = psycopg2.connect(args.dsn)
+    conn.autocommit = True
+    cur = conn.cursor()
+
+    started = time.perf_counter()
+    rows = build_dataset(cur, args.years)
+    print(f"📦 합성 자료: {args.years}년, {rows:,}행 ({time.perf_counter() - started:.1f}초)")
+
+    try:
+        for index_name, ddl in INDEXES.items():
+            cur.execute("DROP INDEX IF EXISTS bench.bench_weather_ts")
+            cur.execute(ddl)
+            cur.execute("SELECT pg_size_pretty(pg_relation_size('bench.bench_weather_ts'))")
+            print(f"\n🗂️ {index_name} 인덱스 ({cur.fetchone()[0]})")
+
+            for name, (old_query, old_params), (new_query, new_params) in cases(args.years):
+                old_ms = latency(cur, old_query, old_params, args.repeat)
+                new_ms = latency(cur, new_query, new_params, args.repeat)
+                print(f"  [{name}]")
+                print(f"    DATE()  : {old_ms:8.1f} ms  {plan_summary(cur, old_query, old_params)}")
+                print(f"    반열림  : {new_ms:8.1f} ms  {plan_summary(cur, new_query, new_params)}")
+                print(f"    speedup : {old_ms / new_ms:.1f}x")
+    finally:
+        if not args.keep:
+            cur.execute("DROP SCHEMA IF EXISTS bench CASCADE")
+        cur.close()
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
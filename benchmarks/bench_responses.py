@@ -0,0 +1,88 @@
+"""
+API 응답 직렬화/압축 벤치마크: today, range, recent 엔드포인트의 응답당 CPU 시간과 전송 바이트
+Accept-Encoding(identity, gzip, br)별로 같은 요청을 반복해 앱 프로세스 CPU 시간(process_time)과 실제 전송 크기를 측정
+직렬화만 따로: 같은 행을 response_model(pydantic) 경로와 FastJSONResponse(orjson)로 인코딩한 시간 비교
+사용법: python benchmarks/bench_responses.py --start-date 2024-05-01 --end-date 2024-05-07 --repeat 10
+"""
+import argparse
+import os
+import sys
+import time
+from typing import List
+
+from pydantic import TypeAdapter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+import aws_api  # noqa: E402
+import aws_http  # noqa: E402
+from aws_http import FastJSONResponse  # noqa: E402
+
+ENCODINGS = ['identity', 'gzip', 'br']
+
+
+def cpu_per_request(client, path, encoding, repeat):
+    """(응답당 CPU ms, 전송 바이트, 본문 바이트)"""
+    headers = {'Accept-Encoding': encoding}
+    client.get(path, headers=headers)
+    started = time.process_time()
+    for _ in range(repeat):
+        response = client.get(path, headers=headers)
+    elapsed = time.process_time() - started
+    return elapsed / repeat * 1000, response.num_bytes_downloaded, len(response.content)
+
+
+def serializer_compare(rows, repeat):
+    """response_model 경로(dict -> WeatherData 검증 -> JSON) vs orjson 직접 인코딩 (ms)"""
+    adapter = TypeAdapter(List[aws_api.WeatherData])
+    results = {}
+    for name, encode in [
+        ('pydantic', lambda: adapter.dump_json(adapter.validate_python(rows))),
+        ('orjson', lambda: FastJSONResponse(rows).body),
+    ]:
+        started = time.process_time()
+        for _ in range(repeat):
+            encode()
+        results[name] = (time.process_time() - started) / repeat * 1000
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--start-date', default='2024-05-01')
+    parser.add_argument('--end-date', default='2024-05-07')
+    parser.add_argument('--hours', type=int, default=24)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    paths = {
+        'today': '/api/weather/today',
+        'range': f'/api/weather/range?start_date={args.start_date}&end_date={args.end_date}'
+                 f'&limit={aws_api.RANGE_MAX_PAGE_SIZE}',
+        'recent': f'/api/weather/recent?hours={args.hours}',
+    }
+
+    with TestClient(aws_api.app) as client:
+        if aws_http.brotli is None:
+            print("⚠️ brotli 미설치: br 요청도 gzip으로 응답")
+        print(f"📊 응답당 CPU 시간 / 전송 크기 ({args.repeat}회 평균)")
+        for name, path in paths.items():
+            response = client.get(path, headers={'Accept-Encoding': 'identity'})
+            if response.status_code != 200:
+                print(f"  {name:6}: {response.status_code} 건너뜀")
+                continue
+            for encoding in ENCODINGS:
+                cpu_ms, wire, body = cpu_per_request(client, path, encoding, args.repeat)
+                print(f"  {name:6} {encoding:8}: CPU {cpu_ms:7.1f} ms  전송 {wire / 1e3:9.1f} KB"
+                      f"  (본문 {body / 1e3:9.1f} KB, {body / max(wire, 1):4.1f}x)")
+
+        rows = client.get(paths['range']).json()
+    times = serializer_compare(rows, args.repeat)
+    print(f"\n🧮 직렬화만 ({len(rows):,}행): pydantic {times['pydantic']:.1f} ms, orjson {times['orjson']:.1f} ms "
+          f"({times['pydantic'] / times['orjson']:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
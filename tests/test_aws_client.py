@@ -0,0 +1,126 @@
+"""StationClient 재시도/포기/타임아웃/통계 테스트 (로컬 stub 서버 사용)"""
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import backoff
+import pytest
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aws_client import StationClient  # noqa: E402
+
+
+class StubStation:
+    """
+    응답 순서를 정해 둔 dspnet.aspx stub 서버
+    responses: (상태 코드, 본문, 지연 초) 목록. 다 쓰면 마지막 응답을 반복
+    """
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.paths = []
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.paths.append(self.path)
+                index = min(len(stub.paths), len(stub.responses)) - 1
+                status, body, delay = stub.responses[index]
+                time.sleep(delay)
+                data = body.encode('utf-8')
+                try:
+                    self.send_response(status)
+                    self.send_header('Content-Length', str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}/dspnet.aspx"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def hits(self):
+        return len(self.paths)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def no_jitter_wait(monkeypatch):
+    """백오프 대기 시간을 0으로 (재시도 흐름만 확인)"""
+    waits = []
+
+    def jitter(value):
+        waits.append(value)
+        return 0
+
+    monkeypatch.setattr(backoff, 'full_jitter', jitter)
+    return waits
+
+
+def test_server_errors_are_retried_with_backoff(no_jitter_wait):
+    with StubStation([(500, 'error', 0), (503, 'busy', 0), (200, 'payload', 0)]) as stub:
+        client = StationClient(base_url=stub.url, max_tries=5)
+        assert client.fetch_day(2024, '05', '03', site=85, dev=1) == 'payload'
+
+    assert stub.hits == 3
+    assert 'Site=85' in stub.paths[0] and 'Day=03' in stub.paths[0]
+    # 지수 백오프: 재시도할 때마다 최대 대기 시간이 두 배
+    assert no_jitter_wait == [1, 2]
+    stats = client.stats()
+    assert (stats['requests'], stats['errors'], stats['retries']) == (3, 2, 2)
+
+
+def test_client_errors_give_up_immediately(no_jitter_wait):
+    with StubStation([(404, 'not found', 0), (200, 'payload', 0)]) as stub:
+        client = StationClient(base_url=stub.url, max_tries=5)
+        with pytest.raises(requests.HTTPError) as error:
+            client.fetch_day(2024, '05', '03')
+
+    assert error.value.response.status_code == 404
+    assert stub.hits == 1
+    assert no_jitter_wait == []
+    assert client.stats()['retries'] == 0
+
+
+def test_read_timeout_is_retried_then_raised(no_jitter_wait):
+    with StubStation([(200, 'slow', 1.0)]) as stub:
+        client = StationClient(base_url=stub.url, read_timeout=0.2, max_tries=2)
+        started = time.perf_counter()
+        with pytest.raises(requests.Timeout):
+            client.fetch_day(2024, '05', '03')
+        elapsed = time.perf_counter() - started
+
+    assert stub.hits == 2
+    assert elapsed < 1.0
+    stats = client.stats()
+    assert (stats['requests'], stats['errors'], stats['retries']) == (2, 2, 1)
+
+
+def test_stats_counts_requests_and_latency():
+    with StubStation([(200, 'payload', 0.05)]) as stub:
+        client = StationClient(base_url=stub.url)
+        assert client.stats() == {'requests': 0, 'errors': 0, 'retries': 0}
+        for _ in range(4):
+            client.fetch_day(2024, '05', '03')
+
+    stats = client.stats()
+    assert (stats['requests'], stats['errors'], stats['retries']) == (4, 0, 0)
+    assert 50 <= stats['p50_ms'] <= stats['p95_ms'] <= stats['max_ms']
+    assert stats['mean_ms'] >= 50
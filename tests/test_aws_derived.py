@@ -0,0 +1,142 @@
+"""파생 지표(VPD, 이슬점, GDD, DLI) 참고값/일 단위 묶음/캐시 무효화 테스트"""
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aws_derived import (DERIVED_COLUMNS, DerivedDayCache, daily_light_integral, daily_metric_rows,  # noqa: E402
+                         dew_point, growing_degree_days, saturation_vapour_pressure, vapour_pressure_deficit)
+
+# 2024-01-01 (1970-01-01부터의 일 수)
+DAY = 19723
+
+
+def column(rows, name):
+    return [row[DERIVED_COLUMNS.index(name)] for row in rows]
+
+
+@pytest.mark.parametrize('temp, expected', [
+    # FAO-56 표 2.3
+    (10, 1.228),
+    (20, 2.338),
+    (30, 4.243),
+])
+def test_saturation_vapour_pressure(temp, expected):
+    assert saturation_vapour_pressure(temp) == pytest.approx(expected, abs=0.001)
+
+
+@pytest.mark.parametrize('temp, humid, expected', [
+    (25, 50, 1.584),
+    (20, 100, 0.0),
+    (20, 120, 0.0),   # 100% 초과는 100%로
+])
+def test_vapour_pressure_deficit(temp, humid, expected):
+    assert vapour_pressure_deficit(temp, humid) == pytest.approx(expected, abs=0.001)
+
+
+@pytest.mark.parametrize('temp, humid, expected', [
+    (25, 60, 16.7),
+    (20, 100, 20.0),
+    (10, 50, 0.1),
+])
+def test_dew_point(temp, humid, expected):
+    assert dew_point(temp, humid) == pytest.approx(expected, abs=0.05)
+
+
+def test_dew_point_zero_humidity_is_finite():
+    assert np.isfinite(dew_point(20, 0))
+
+
+@pytest.mark.parametrize('temp_min, temp_max, expected', [
+    (15, 30, 12.5),
+    (5, 35, 10.0),    # 최저 10, 최고 30으로 자름
+    (0, 8, 0.0),
+])
+def test_growing_degree_days(temp_min, temp_max, expected):
+    assert growing_degree_days(temp_min, temp_max) == pytest.approx(expected)
+
+
+def test_daily_light_integral():
+    # PPFD 500 µmol/m²/s로 12시간, 나머지 12시간 0 -> 500 x 43200 s = 21.6 mol/m²/일
+    assert daily_light_integral(250) == pytest.approx(21.6)
+
+
+def test_dli_from_radiation():
+    # 일사량 500 W/m² 12시간 = 21.6 MJ/m², 2.02 µmol/J -> 43.632 mol/m²/일
+    rows = [(85, 1, DAY, 20.0, 50.0, 500.0 if 360 <= minute < 1080 else 0.0) for minute in range(1440)]
+    (row,) = daily_metric_rows(rows)
+    assert column([row], 'dli') == [pytest.approx(43.632)]
+    assert column([row], 'light_coverage') == [1.0]
+
+
+def test_dli_fills_missing_minutes_with_observed_mean():
+    # 낮 12시간만 관측되면 관측된 평균(500 W/m²)으로 하루를 채움 -> 87.264, 관측 비율 0.5
+    rows = [(85, 1, DAY, 20.0, 50.0, 500.0 if 360 <= minute < 1080 else None) for minute in range(1440)]
+    (row,) = daily_metric_rows(rows)
+    assert column([row], 'dli') == [pytest.approx(87.264)]
+    assert column([row], 'light_coverage') == [0.5]
+
+
+def test_daily_metric_rows_groups_by_station_and_day():
+    rows = [
+        (85, 1, DAY, 15.0, 80.0, 100.0),
+        (85, 1, DAY, 30.0, None, None),
+        (85, 1, DAY + 1, None, None, None),
+        (85, 2, DAY + 1, 20.0, 100.0, 0.0),
+    ]
+    result = daily_metric_rows(rows)
+    assert [row[:4] for row in result] == [
+        (85, 1, date(2024, 1, 1), 2),
+        (85, 1, date(2024, 1, 2), 1),
+        (85, 2, date(2024, 1, 2), 1),
+    ]
+    assert column(result, 'temp_mean') == [22.5, None, 20.0]
+    assert column(result, 'temp_min') == [15.0, None, 20.0]
+    assert column(result, 'gdd') == [pytest.approx(12.5), None, pytest.approx(10.0)]
+    # 습도가 없는 행은 VPD/이슬점에서 빠짐
+    assert column(result, 'vpd_mean')[0] == pytest.approx(vapour_pressure_deficit(15, 80))
+    assert column(result, 'dew_point_mean')[2] == pytest.approx(20.0)
+    assert column(result, 'light_coverage') == [1 / 1440, 0.0, 1 / 1440]
+
+
+def test_daily_metric_rows_empty():
+    assert daily_metric_rows([]) == []
+
+
+def test_derived_day_cache_invalidates_matching_site_and_day():
+    cache = DerivedDayCache()
+    day = date(2024, 1, 1)
+    for key in [(None, 1), (85, 1), (86, 1)]:
+        cache.put(day, key, ['row'], cache.generation)
+    cache.put(date(2024, 1, 2), (85, 1), ['row'], cache.generation)
+
+    cache.invalidate({'site': 85, 'dev': 1, 'first': '2024-01-01T23:50:00', 'last': '2024-01-01T23:59:00'})
+    assert cache.get(day, (None, 1)) == (False, None)
+    assert cache.get(day, (85, 1)) == (False, None)
+    assert cache.get(day, (86, 1)) == (True, ['row'])
+    assert cache.get(date(2024, 1, 2), (85, 1)) == (True, ['row'])
+
+    cache.invalidate(None)
+    assert cache.stats()['entries'] == 0
+
+
+def test_derived_day_cache_skips_put_after_invalidation():
+    cache = DerivedDayCache()
+    generation = cache.generation
+    cache.invalidate({'site': 85, 'dev': 1, 'first': '2024-01-05T00:00:00', 'last': '2024-01-05T00:00:00'})
+    cache.put(date(2024, 1, 1), (85, 1), ['row'], generation)
+    assert cache.get(date(2024, 1, 1), (85, 1)) == (False, None)
+
+
+def test_derived_day_cache_evicts_least_recently_used():
+    cache = DerivedDayCache(max_entries=2)
+    for day in (1, 2):
+        cache.put(date(2024, 1, day), (85, 1), [day], cache.generation)
+    cache.get(date(2024, 1, 1), (85, 1))
+    cache.put(date(2024, 1, 3), (85, 1), [3], cache.generation)
+    assert cache.get(date(2024, 1, 2), (85, 1)) == (False, None)
+    assert cache.get(date(2024, 1, 1), (85, 1)) == (True, [1])
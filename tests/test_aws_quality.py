@@ -0,0 +1,50 @@
+"""품질 플래그 계산 테스트"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from aws_quality import FLAG_STUCK, STUCK_RUN, compute_flags  # noqa: E402
+
+
+def make_frame(minutes, temp, humid):
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-07-01 00:00', periods=minutes, freq='min'),
+        'temp': temp,
+        'humid': humid,
+        'radn': 0.0,
+        'wind_degree': 0.0,
+        'wind': 1.0,
+        'rainfall': 0.0,
+        'battery': 12.5,
+    })
+
+
+def test_stuck_humidity_is_flagged():
+    minutes = STUCK_RUN + 60
+    temp = 20 + 0.1 * np.sin(np.arange(minutes) / 10)
+    flags = compute_flags(make_frame(minutes, temp, 70.0))
+    assert (flags & FLAG_STUCK).all()
+
+
+def test_saturated_humidity_is_not_stuck():
+    # 비 오는 4시간: 습도 100% 유지, 기온은 변함
+    minutes = 240
+    temp = 18 + 0.1 * np.sin(np.arange(minutes) / 10)
+    flags = compute_flags(make_frame(minutes, temp, 100.0))
+    assert not (flags & FLAG_STUCK).any()
+
+
+def test_stuck_temperature_during_saturation_is_flagged():
+    flags = compute_flags(make_frame(240, 18.0, 100.0))
+    assert (flags & FLAG_STUCK).all()
+
+
+def test_stuck_run_shorter_than_limit_is_not_flagged():
+    minutes = STUCK_RUN - 1
+    temp = 20 + 0.1 * np.sin(np.arange(minutes) / 10)
+    flags = compute_flags(make_frame(minutes, temp, 70.0))
+    assert not (flags & FLAG_STUCK).any()